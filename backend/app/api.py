@@ -1189,9 +1189,14 @@ async def recordings_stop(
 
 
 @app.get("/recordings/{recording_id}/bundle")
-async def recordings_bundle(recording_id: str) -> Dict[str, object]:
+async def recordings_bundle(
+    recording_id: str,
+    include_frames: bool = Query(default=True, alias="includeFrames"),
+) -> Dict[str, object]:
     try:
-        return await recording_store.get_bundle_payload(recording_id)
+        return await recording_store.get_bundle_payload(
+            recording_id, include_frames=include_frames
+        )
     except KeyError as exc:
         raise HTTPException(status_code=404, detail="Recording not found") from exc
 
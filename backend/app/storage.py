@@ -4,6 +4,7 @@ import asyncio
 import json
 import sqlite3
 import uuid
+import weakref
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
@@ -56,7 +57,12 @@ class RecordingStore:
     """SQLite-backed storage for recordings captured via the frontend."""
 
     def __init__(self, *, db_path: Optional[Path] = None) -> None:
-        self._lock = asyncio.Lock()
+        # One lock per recording: writers to different sessions never contend.
+        # Weak values let idle locks be collected instead of growing forever;
+        # creation needs no guard because nothing awaits between lookup and insert.
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
         default_path = Path(__file__).resolve().parent / "data" / "recordings.sqlite3"
         self._db_path = Path(db_path or default_path).resolve()
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -103,6 +109,13 @@ class RecordingStore:
                 """
             )
 
+    def _lock_for(self, recording_id: str) -> asyncio.Lock:
+        lock = self._locks.get(recording_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[recording_id] = lock
+        return lock
+
     async def start(
         self,
         title: Optional[str],
@@ -110,9 +123,10 @@ class RecordingStore:
         recording_id: Optional[str] = None,
         start_url: Optional[str] = None,
     ) -> StoredRecording:
-        async with self._lock:
-            rec_id = recording_id or uuid.uuid4().hex
+        rec_id = recording_id or uuid.uuid4().hex
+        async with self._lock_for(rec_id):
             now = _utc_now()
+            now_iso = now.isoformat()
 
             def _write() -> StoredRecording:
                 with sqlite3.connect(self._db_path) as conn:
@@ -140,8 +154,8 @@ class RecordingStore:
                             "started",
                             None,  # bundle_json starts as NULL
                             json.dumps([]),  # events_json starts as empty array
-                            now.isoformat(),
-                            now.isoformat(),
+                            now_iso,
+                            now_iso,
                             None,  # ended_at starts as NULL
                             start_url,
                         ),
@@ -163,8 +177,9 @@ class RecordingStore:
             return await asyncio.to_thread(_write)
 
     async def complete(self, recording_id: str, bundle: RecordingBundle) -> StoredRecording:
-        async with self._lock:
+        async with self._lock_for(recording_id):
             now = _utc_now()
+            now_iso = now.isoformat()
 
             def _write() -> StoredRecording:
                 with sqlite3.connect(self._db_path) as conn:
@@ -201,8 +216,8 @@ class RecordingStore:
                         (
                             "completed",
                             bundle_json,
-                            now.isoformat(),
-                            now.isoformat(),
+                            now_iso,
+                            now_iso,
                             recording_id,
                         ),
                     )
@@ -225,7 +240,7 @@ class RecordingStore:
             return await asyncio.to_thread(_write)
 
     async def get(self, recording_id: str) -> StoredRecording:
-        async with self._lock:
+        async with self._lock_for(recording_id):
             def _read() -> StoredRecording:
                 with sqlite3.connect(self._db_path) as conn:
                     conn.row_factory = sqlite3.Row
@@ -265,7 +280,7 @@ class RecordingStore:
             return await asyncio.to_thread(_read)
 
     async def exists(self, recording_id: str) -> bool:
-        async with self._lock:
+        async with self._lock_for(recording_id):
             def _check() -> bool:
                 with sqlite3.connect(self._db_path) as conn:
                     cursor = conn.execute(
@@ -279,8 +294,8 @@ class RecordingStore:
     async def append_events(self, recording_id: str, events: List[Dict[str, object]]) -> None:
         if not events:
             return
-        async with self._lock:
-            now = _utc_now()
+        async with self._lock_for(recording_id):
+            now_iso = _utc_now().isoformat()
 
             def _write() -> None:
                 with sqlite3.connect(self._db_path) as conn:
@@ -301,14 +316,21 @@ class RecordingStore:
                     # Update database
                     conn.execute(
                         "UPDATE recordings SET events_json = ?, updated_at = ? WHERE recording_id = ?",
-                        (json.dumps(existing_events), now.isoformat(), recording_id),
+                        (json.dumps(existing_events), now_iso, recording_id),
                     )
                     conn.commit()
 
             await asyncio.to_thread(_write)
 
-    async def get_bundle_payload(self, recording_id: str) -> Dict[str, object]:
-        async with self._lock:
+    async def get_bundle_payload(
+        self, recording_id: str, *, include_frames: bool = True
+    ) -> Dict[str, object]:
+        """
+        Return the bundle as an API payload with events and metadata attached.
+        With include_frames=False the base64 PNG frames are dropped before
+        validation, so metadata-only callers skip the (often MB-scale) copies.
+        """
+        async with self._lock_for(recording_id):
             def _read() -> Dict[str, object]:
                 with sqlite3.connect(self._db_path) as conn:
                     conn.row_factory = sqlite3.Row
@@ -324,6 +346,8 @@ class RecordingStore:
                     if row["bundle_json"]:
                         try:
                             bundle_data = json.loads(row["bundle_json"])
+                            if not include_frames:
+                                bundle_data["frames"] = []
                             bundle = RecordingBundle.model_validate(bundle_data)
                             bundle_payload = bundle.model_dump(by_alias=True)
                         except Exception:
@@ -363,48 +387,48 @@ class RecordingStore:
 
     async def list(self) -> List[StoredRecording]:
         """List all recordings ordered by most recent first."""
-        async with self._lock:
-            def _read() -> List[StoredRecording]:
-                with sqlite3.connect(self._db_path) as conn:
-                    conn.row_factory = sqlite3.Row
-                    cursor = conn.execute(
-                        """
-                        SELECT * FROM recordings
-                        ORDER BY updated_at DESC
-                        LIMIT 100
-                        """
-                    )
-                    rows = cursor.fetchall()
+        # A single SELECT is already consistent; no per-recording lock applies.
+        def _read() -> List[StoredRecording]:
+            with sqlite3.connect(self._db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.execute(
+                    """
+                    SELECT * FROM recordings
+                    ORDER BY updated_at DESC
+                    LIMIT 100
+                    """
+                )
+                rows = cursor.fetchall()
 
-                    recordings: List[StoredRecording] = []
-                    for row in rows:
-                        # Deserialize bundle if present
-                        bundle = None
-                        if row["bundle_json"]:
-                            try:
-                                bundle_data = json.loads(row["bundle_json"])
-                                bundle = RecordingBundle.model_validate(bundle_data)
-                            except Exception:
-                                pass
-
-                        # Deserialize events
-                        events = json.loads(row["events_json"]) if row["events_json"] else []
-
-                        recordings.append(StoredRecording(
-                            recording_id=row["recording_id"],
-                            title=row["title"],
-                            status=row["status"],
-                            created_at=datetime.fromisoformat(row["created_at"]),
-                            updated_at=datetime.fromisoformat(row["updated_at"]),
-                            bundle=bundle,
-                            events=events,
-                            ended_at=datetime.fromisoformat(row["ended_at"]) if row["ended_at"] else None,
-                            start_url=row["start_url"],
-                        ))
-
-                    return recordings
+                recordings: List[StoredRecording] = []
+                for row in rows:
+                    # Deserialize bundle if present
+                    bundle = None
+                    if row["bundle_json"]:
+                        try:
+                            bundle_data = json.loads(row["bundle_json"])
+                            bundle = RecordingBundle.model_validate(bundle_data)
+                        except Exception:
+                            pass
 
-            return await asyncio.to_thread(_read)
+                    # Deserialize events
+                    events = json.loads(row["events_json"]) if row["events_json"] else []
+
+                    recordings.append(StoredRecording(
+                        recording_id=row["recording_id"],
+                        title=row["title"],
+                        status=row["status"],
+                        created_at=datetime.fromisoformat(row["created_at"]),
+                        updated_at=datetime.fromisoformat(row["updated_at"]),
+                        bundle=bundle,
+                        events=events,
+                        ended_at=datetime.fromisoformat(row["ended_at"]) if row["ended_at"] else None,
+                        start_url=row["start_url"],
+                    ))
+
+                return recordings
+
+        return await asyncio.to_thread(_read)
 
 
 class PlanStore:
@@ -507,6 +531,7 @@ class PlanStore:
         plan, _ = normalize_plan_variables(plan)
         plan_key = plan_id or uuid.uuid4().hex
         now = _utc_now()
+        now_iso = now.isoformat()
         plan_json = self._plan_to_json(plan)
         checkpoints_json = json.dumps(checkpoints or {})
 
@@ -519,7 +544,7 @@ class PlanStore:
                         (plan_key,),
                     )
                     existing = cursor.fetchone()
-                    created_at = existing["created_at"] if existing else now.isoformat()
+                    created_at = existing["created_at"] if existing else now_iso
                     conn.execute(
                         """
                         INSERT INTO plans (
@@ -552,7 +577,7 @@ class PlanStore:
                             raw_response,
                             checkpoints_json,
                             created_at,
-                            now.isoformat(),
+                            now_iso,
                         ),
                     )
                     conn.commit()
@@ -644,44 +669,73 @@ class PlanStore:
         name: Optional[str] = None,
         plan: Optional[Plan] = None,
     ) -> StoredPlan:
+        if plan is None:
+            # Name-only update: the plan being renamed must be read in the same
+            # critical section as the write, or a concurrent update(plan=...)
+            # landing in between would be overwritten with the old plan.
+            async with self._lock:
+                def _rename() -> StoredPlan:
+                    with sqlite3.connect(self._db_path) as conn:
+                        conn.row_factory = sqlite3.Row
+                        row = conn.execute(
+                            "SELECT * FROM plans WHERE plan_id = ?",
+                            (plan_id,),
+                        ).fetchone()
+                        if row is None:
+                            raise KeyError(plan_id)
+
+                        target_plan = self._row_to_stored_plan(row).plan
+                        if name:
+                            target_plan = self._copy_with_name(target_plan, name)
+                        target_plan, _ = normalize_plan_variables(target_plan)
+                        return self._write_plan_row(
+                            conn, plan_id, target_plan, self._plan_to_json(target_plan)
+                        )
+
+                return await asyncio.to_thread(_rename)
+
+        # Full plan supplied: nothing depends on the stored row, so the Pydantic
+        # copy, variable normalization and JSON encoding run before taking the
+        # lock and concurrent readers aren't stalled behind them.
+        target_plan = plan
+        if name:
+            target_plan = self._copy_with_name(target_plan, name)
+        target_plan, _ = normalize_plan_variables(target_plan)
+        plan_json = self._plan_to_json(target_plan)
+
         async with self._lock:
             def _write() -> StoredPlan:
                 with sqlite3.connect(self._db_path) as conn:
                     conn.row_factory = sqlite3.Row
-                    # Read current
-                    row = conn.execute(
-                        "SELECT * FROM plans WHERE plan_id = ?",
-                        (plan_id,),
-                    ).fetchone()
-                    if row is None:
-                        raise KeyError(plan_id)
-
-                    current = self._row_to_stored_plan(row)
-                    target_plan = plan or current.plan
-                    if name:
-                        target_plan = self._copy_with_name(target_plan, name)
-                    target_plan, _ = normalize_plan_variables(target_plan)
-                    plan_json = self._plan_to_json(target_plan)
-
-                    # Update
-                    now_iso = _utc_now().isoformat()
-                    conn.execute(
-                        "UPDATE plans SET name = ?, plan_json = ?, updated_at = ? WHERE plan_id = ?",
-                        (target_plan.name, plan_json, now_iso, plan_id),
-                    )
-                    conn.commit()
-
-                    # Read back
-                    updated_row = conn.execute(
-                        "SELECT * FROM plans WHERE plan_id = ?",
-                        (plan_id,),
-                    ).fetchone()
-                    if updated_row is None:  # pragma: no cover - defensive
-                        raise KeyError(plan_id)
-                    return self._row_to_stored_plan(updated_row)
+                    return self._write_plan_row(conn, plan_id, target_plan, plan_json)
 
             return await asyncio.to_thread(_write)
 
+    def _write_plan_row(
+        self,
+        conn: sqlite3.Connection,
+        plan_id: str,
+        target_plan: Plan,
+        plan_json: str,
+    ) -> StoredPlan:
+        now_iso = _utc_now().isoformat()
+        cursor = conn.execute(
+            "UPDATE plans SET name = ?, plan_json = ?, updated_at = ? WHERE plan_id = ?",
+            (target_plan.name, plan_json, now_iso, plan_id),
+        )
+        if cursor.rowcount == 0:
+            raise KeyError(plan_id)
+        conn.commit()
+
+        # Read back
+        updated_row = conn.execute(
+            "SELECT * FROM plans WHERE plan_id = ?",
+            (plan_id,),
+        ).fetchone()
+        if updated_row is None:  # pragma: no cover - defensive
+            raise KeyError(plan_id)
+        return self._row_to_stored_plan(updated_row)
+
 
 # -----------------------------------------------------------------------------
 # Visual checkpoint helpers (module-level, in-memory)
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import asyncio
-import base64
+import binascii
+import bisect
+import functools
 import json
 import logging
+import math
 import os
 import re
+import weakref
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Set, Union
+from itertools import islice
+from operator import attrgetter
+from typing import Any, Callable, Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
 
 from pydantic import BaseModel, Field
 
@@ -16,6 +22,27 @@ try:  # pragma: no cover - compatibility shim for Pydantic v1
 except ImportError:  # pragma: no cover
     ConfigDict = None  # type: ignore
 
+try:  # pragma: no cover - optional accelerator; stdlib json is the fallback
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can keep
+# catching the stdlib exception whichever decoder is active.
+_json_loads: Callable[[Union[str, bytes]], Any] = (
+    orjson.loads if orjson is not None else json.loads
+)
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize ``obj`` to a JSON ``str``, keeping non-ASCII characters as-is."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:  # orjson.JSONEncodeError, e.g. ints beyond 64 bits
+            pass
+    return json.dumps(obj, ensure_ascii=False)
+
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +63,12 @@ except Exception:  # pragma: no cover
 
 
 DEFAULT_PLAN_MODEL = "gemini-2.5-pro"
+# Upper bound on recorded events rendered by the legacy _summarize_events
+# fallback; timeline cues and DOM context always see every event.
+MAX_PROMPT_EVENTS = 2_000
+# Frames whose base64 payload exceeds this are skipped before decoding; Gemini
+# caps inline request data at ~20 MB, so one oversize PNG would sink the call.
+MAX_FRAME_PNG_BASE64_LEN = 8 * 1024 * 1024
 PLAN_JSON_SCHEMA: Dict[str, Any] = {
     "type": "object",
     "additionalProperties": False,
@@ -98,8 +131,263 @@ OPENAI_PLAN_JSON_SCHEMA: Dict[str, Any] = {
     "required": ["name", "startUrl", "steps"]
 }
 
+# Example plan shown in the synthesis prompt. Only name/startUrl vary per
+# request, so the rest is baked in rather than re-serialised every time.
+_PLAN_SKELETON_TEMPLATE = (
+    '{{"name": {name}, "startUrl": {start_url}, "vars": {{"example": ""}}, '
+    '"steps": [{{"id": "s1", "title": "Human readable summary of what happens", '
+    '"instructions": "Natural language guidance for the Computer Use agent '
+    '(full sentences)."}}]}}'
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _render_plan_skeleton(name: str, start_url: str) -> str:
+    # Plan names and start URLs repeat across re-synthesis of a recording.
+    return _PLAN_SKELETON_TEMPLATE.format(
+        name=json.dumps(name, ensure_ascii=False),
+        start_url=json.dumps(start_url, ensure_ascii=False),
+    )
+
+
+# Opening lines of the synthesis prompt, ahead of the example plan JSON.
+_PROMPT_INTRO = "\n".join(
+    [
+        "You are building an automation plan for Gemini Computer Use.",
+        "Your goal is to create ATOMIC, SINGLE-ACTION instructions where each step performs exactly ONE discrete action.",
+        "",
+        "Return strict JSON following this schema:",
+    ]
+)
+
+
+# Static plan-writing rules and Computer Use action reference.
+_PROMPT_RULES = "\n".join(
+    [
+        "",
+        "CRITICAL: The 'name' field is the OVERALL GOAL of this automation.",
+        "- Analyze the recording and infer what the user is trying to accomplish",
+        "- Write a descriptive name that captures the intent (e.g., 'Draw hi on tldraw', 'Search for flights to Paris', 'Create new document')",
+        "- This name will be shown to the user and to the AI agent as the overall goal",
+        "- DO NOT use generic names like 'Captured flow' or 'recorded run'",
+        "- Keep it concise (≤ 60 chars) but meaningful",
+        "",
+        "CRITICAL INSTRUCTION STYLE - ONE ACTION PER STEP:",
+        "- Each step must contain EXACTLY ONE discrete action (one click, one type, one drag, one scroll, etc.)",
+        "- NEVER combine multiple actions in a single step (e.g., 'Click X and then type Y' is WRONG - split into 2 steps)",
+        "- NEVER write compound instructions like 'Select tool and draw shape' - split into separate steps",
+        "- Each instruction should map to exactly ONE Computer Use action call",
+        '- Good: Step 1: "Click the pen tool button", Step 2: "Draw a line on the canvas"',
+        '- Bad: "Select the pen tool and draw a line" (this is 2 actions, needs 2 steps)',
+        "- Focus on WHAT needs to be achieved in this single action, not HOW to click specific elements",
+        '- Example: "Click the pen tool button in the toolbar" (single click action)',
+        '- Example: "Type the search term into the search box" (single type action)',
+        '- Example: "Draw a horizontal line on the canvas" (single drag action)',
+        "- Let the Computer Use agent figure out the specific UI coordinates",
+        "- Instructions should work even if the UI layout changes slightly",
+        "",
+        "NAVIGATION RULES:",
+        "- The startUrl will be loaded AUTOMATICALLY before any steps execute",
+        "- DO NOT include navigation instructions in the first step (e.g., 'Open [site]', 'Navigate to [url]')",
+        "- The user is ALREADY on the startUrl when step 1 begins",
+        "- Start directly with the first meaningful action (e.g., 'Select the pen tool', not 'Open tldraw and select...')",
+        "",
+        "Rules:",
+        "- Use deterministic step IDs 's1', 's2', ... in chronological order.",
+        "- ATOMIC STEPS: Each step = ONE action only. Never combine multiple actions (click + type, select + drag, etc.).",
+        "- If the user performs multiple interactions, create multiple steps - one per interaction.",
+        "- Align step boundaries to the provided markers (1:1 in order) when markers exist.",
+        "- Keep step IDs stable and human-readable titles short (≤ 80 chars).",
+        "- Infer the USER'S INTENT for each individual action from the interaction timeline.",
+        "- Each step instruction should describe ONE concrete action:",
+        "  • ONE click → 'Click the [button/link name]'",
+        "  • ONE drag → 'Draw [shape/line description] on the canvas'",
+        "  • ONE type → 'Type {variable} into the [field name]'",
+        "  • ONE scroll → 'Scroll down the page'",
+        "  • ONE key press → 'Press Enter to submit'",
+        "- WRONG: 'Click the text box and type your name' (2 actions → needs 2 steps)",
+        "- RIGHT: Step 1: 'Click the name input field', Step 2: 'Type {userName} into the field'",
+        '- When referencing UI elements, quote the visible label or role when available (e.g., "Click the \'Search\' button", "Click the \'Settings\' menu") and avoid low-level selectors.',
+        "- Explicitly call out key presses as separate steps (e.g., pressing Enter or shortcuts).",
+        "- Whenever you mention text the user typed that should remain flexible (like names, emails, greetings), replace the literal with a variable placeholder {variableName} and record that variable in vars.",
+        "- Apply the same placeholder rule to the overall plan name and each step title/instruction; never hard-code sample values if a variable exists.",
+        "- Avoid raw x,y coordinates completely unless absolutely necessary for drawing/positioning.",
+        '- Always include the top-level startUrl as a string; use an empty string ("") if unknown.',
+        "- When you reference a plan variable use the {var} notation and register it under vars.",
+        '- All entries in vars must be strings (coerce numbers to strings).',
+        "- Each step describes exactly ONE action with a clear, concise outcome.",
+        "- Write instructions that are resilient to minor UI changes but still atomic.",
+        "",
+        "=== GEMINI COMPUTER USE ACTIONS (CRITICAL) ===",
+        "The agent executing this plan has access to the following Computer Use actions.",
+        "Your step instructions MUST reference these actions when describing what needs to be done:",
+        "",
+        "NAVIGATION:",
+        '  • navigate(url) - Go directly to a URL: "Navigate to https://example.com"',
+        '  • open_web_browser() - Open browser: "Open the web browser"',
+        '  • go_back() / go_forward() - Browser navigation: "Go back to the previous page"',
+        '  • search() - Open search engine: "Open Google search"',
+        "",
+        "INTERACTION:",
+        '  • click_at(x, y) - Click at coordinates: "Click the submit button"',
+        '  • hover_at(x, y) - Hover for menus: "Hover over the File menu to reveal options"',
+        '  • type_text_at(x, y, text, press_enter, clear_before_typing) - Type text: "Type \'{searchTerm}\' into the search box and press Enter"',
+        '  • key_combination(keys) - Press keyboard shortcuts: "Press Control+A to select all" or "Press Enter to submit"',
+        "",
+        "SCROLLING:",
+        '  • scroll_document(direction) - Scroll the page: "Scroll down to see more results"',
+        '  • scroll_at(x, y, direction, magnitude) - Scroll specific element: "Scroll down within the chat window"',
+        "",
+        "DRAG AND DRAW:",
+        '  • drag_and_drop(x, y, destination_x, destination_y) - Drag from one point to another',
+        '    - Use for DRAWING: "Draw a line/shape on the canvas" (maps to drag motion)',
+        '    - Use for REPOSITIONING: "Drag the slider to adjust volume"',
+        '    - Use for DRAG-DROP: "Drag the file to the upload area"',
+        "",
+        "TIMING:",
+        '  • wait_5_seconds() - Wait for content to load: "Wait for the page to finish loading"',
+        "",
+        "INSTRUCTION MAPPING EXAMPLES (ATOMIC: each recorded interaction → ONE step):",
+        "",
+        "  Example 1 - Drawing workflow (BAD: compound vs GOOD: atomic):",
+        '  Recorded: "2.1s click → pen tool button"',
+        '            "2.5s drag → (200,300) → (450,320)"',
+        "",
+        '  ❌ BAD (combines 2 actions): "Select pen tool and draw a line"',
+        '  ✓ GOOD (atomic steps):',
+        '    Step 1: "Click the pen tool button in the toolbar"',
+        '    Step 2: "Draw a horizontal line on the canvas"',
+        "",
+        "  Example 2 - Form submission (BAD vs GOOD):",
+        '  Recorded: "3.1s click → input field"',
+        '            "3.2s-3.8s key_hold → typing \'hello\'"',
+        '            "4.0s click → submit button"',
+        "",
+        '  ❌ BAD (combines 3 actions): "Enter {greeting} and submit the form"',
+        '  ✓ GOOD (atomic steps):',
+        '    Step 1: "Click the text input field"',
+        '    Step 2: "Type {greeting} into the input field"',
+        '    Step 3: "Click the Submit button"',
+        "",
+        "  Example 3 - Search workflow (BAD vs GOOD):",
+        '  Recorded: "1.5s click → search box"',
+        '            "2.0s-2.5s typing"',
+        '            "2.6s key_down → Enter"',
+        "",
+        '  ❌ BAD (combines 3 actions): "Search for {searchTerm}"',
+        '  ✓ GOOD (atomic steps):',
+        '    Step 1: "Click the search box"',
+        '    Step 2: "Type {searchTerm} into the search box"',
+        '    Step 3: "Press Enter to search"',
+        "",
+        "  REMEMBER: ONE interaction event = ONE step instruction!",
+        "",
+        "CRITICAL DRAG INSTRUCTION RULES:",
+        "- When you see DRAG events in the timeline, analyze the context:",
+        '  • If on a DRAWING canvas (tldraw, whiteboard, etc.) → "Draw [shape/text] on the canvas"',
+        '  • If moving a UI element (slider, resize handle) → "Adjust the [element] by dragging"',
+        '  • If dragging between containers → "Drag the [item] to [destination]"',
+        "- The agent will automatically use drag_and_drop() with the appropriate coordinates",
+        "- DO NOT write rigid instructions like \"Drag from (100,200) to (500,600)\"",
+        '- INSTEAD write intent: "Draw the letter \'h\' on the canvas" or "Slide the volume control to maximum"',
+        "",
+        'Write instructions in natural language that express INTENT and reference the actions above.',
+        'The Computer Use agent will map your instructions to the appropriate action based on context.',
+    ]
+)
+
+
+# Guidance printed ahead of the interaction timeline cues.
+_PROMPT_TIMELINE_GUIDANCE = "\n".join(
+    [
+        "",
+        "Interaction timeline (chronological, already normalized into high-level cues):",
+        "",
+        "IMPORTANT: Analyze these interactions to INFER THE USER'S GOAL.",
+        "Ask yourself:",
+        "- What is the user trying to accomplish?",
+        "- What tool/feature are they trying to use?",
+        "- What content are they creating or modifying?",
+        "- What is the end result they want?",
+        "",
+        "Then write ONE ATOMIC step for each distinct interaction you identify.",
+        "",
+        "MAP EACH INTERACTION TO ONE STEP (ATOMIC MAPPING):",
+        '• Each CLICK event → ONE step with click_at() action:',
+        '  - "Click the [button/link name]"',
+        '  - Example: If user clicks field then button, create 2 separate steps',
+        '• Each DRAG event → ONE step with drag_and_drop() action:',
+        '  - Drawing context: "Draw [description] on the canvas"',
+        '  - UI manipulation: "Drag the [slider/control] to adjust"',
+        '• Each TYPING sequence → ONE step with type_text_at() action:',
+        '  - "Type \'{variableName}\' into the [field]"',
+        '  - Do NOT combine clicking the field + typing into one step',
+        '• Each KEY_PRESS event (Enter, shortcuts) → ONE step with key_combination() action:',
+        '  - "Press Enter to submit"',
+        '  - "Press Control+A to select all"',
+        '• Each SCROLL event → ONE step with scroll action:',
+        '  - "Scroll down the page"',
+        "",
+        "CRITICAL: If you see 5 interactions in the timeline, you should create ~5 steps (one per interaction).",
+        "Never merge multiple interactions into a single compound step!",
+        "",
+    ]
+)
+
+
+# Guidance printed ahead of the user narration transcript.
+_PROMPT_NARRATION_GUIDANCE = "\n".join(
+    [
+        "",
+        "USER NARRATION (voice-over recorded during the session):",
+        "",
+        "The user narrated their actions while recording. Use this to understand:",
+        "- The INTENT behind each action (what they're trying to accomplish)",
+        "- Variable names they mention verbally (e.g., 'username', 'password', 'search term')",
+        "- Business logic and reasoning for the workflow",
+        "- Context for ambiguous UI interactions",
+        "- Correlate timestamps with interaction timeline to see what was said during each action",
+        "",
+    ]
+)
+
+
+# Trailer for the user's variable hints block.
+_PROMPT_VARIABLE_HINTS_FOLLOWUP = (
+    "Follow these instructions carefully when deciding which values to parameterize. "
+    "Identify the relevant values from the recording and create appropriately named variables."
+)
+
+
+# Closing checklist; always the tail of the prompt.
+_PROMPT_FINAL_REMINDERS = "\n".join(
+    [
+        "",
+        "FINAL REMINDERS:",
+        "1. Set a DESCRIPTIVE 'name' that captures what the user is trying to accomplish.",
+        "2. Create ATOMIC steps - ONE action per step, NEVER combine multiple actions.",
+        "3. Count interactions in the timeline and create approximately the same number of steps.",
+        "4. Replace literal typed strings with variable placeholders {varName} everywhere (name, steps, instructions) if they should be provided at runtime.",
+        "5. Mention the button/link labels or field names the user interacted with (as seen in the cues).",
+        "6. Each step instruction describes ONE concrete action that maps to ONE Computer Use API call.",
+        "7. Use flexible element descriptions, not rigid CSS selectors.",
+        "8. DO NOT include 'Open [site]' or 'Navigate to [url]' in steps - the startUrl loads automatically.",
+        "",
+        "ATOMIC STEP CHECKLIST:",
+        "- Can this step be split into 2+ actions? → If yes, SPLIT IT",
+        '- Does the instruction contain "and", "then", or "after"? → If yes, LIKELY needs splitting',
+        "- Would the Computer Use agent need to call 2+ APIs for this step? → If yes, SPLIT IT",
+        "",
+        "Respond with JSON only. Do not add commentary.",
+    ]
+)
+
+
 VarValue = Union[str, int, float]
 
+# C-level sort key for markers/frames (timestamps are validated floats).
+_BY_TIMESTAMP = attrgetter("timestamp")
+
 
 class _BaseModel(BaseModel):
     """Populate-by-name works on both Pydantic v1 and v2."""
@@ -151,43 +439,104 @@ class PlanSynthesisRequest(_BaseModel):
     provider: Optional[str] = None
     variable_hints: Optional[str] = Field(default=None, alias="variableHints")
 
+# Matches "{{ name }}" or "{name}". Every match starts with "{", which the
+# helpers below use as a memchr-speed fast path before touching the regex.
+# Group 1 is the "{{ }}" body, group 2 the "{ }" body; exactly one participates
+# in any match, so match.lastindex names it with a single integer lookup.
 _PLACEHOLDER_PATTERN = re.compile(
-    r"""
-    \{\{\s*(?P<double>[^{}\s][^{}]*)\s*\}\}
-    |
-    \{(?P<single>[^{}]+)\}
-    """,
-    re.VERBOSE,
+    r"\{\{\s*([^{}\s][^{}]*)\s*\}\}|\{([^{}]+)\}"
 )
 
 
 def _extract_placeholder(match: re.Match[str]) -> Optional[str]:
-    raw = match.group("double") or match.group("single")
-    if raw is None:
+    if match.lastindex is None:
         return None
-    candidate = raw.strip()
+    candidate = match.group(match.lastindex).strip()
     return candidate or None
 
 
+# A compiled template alternates literal text with (key, original_text)
+# placeholders; the original text is kept so unknown keys render unchanged.
+_TemplateSegment = Union[str, Tuple[str, str]]
+
+
+@functools.lru_cache(maxsize=4096)
+def _compile_template(text: str) -> Tuple[_TemplateSegment, ...]:
+    """Split ``text`` once into literal and placeholder segments.
+
+    Plan strings are rendered on every run, so the regex scan is paid once
+    per distinct string; rendering is then a join over dict lookups.
+    """
+    if "{" not in text:
+        return (text,)
+    segments: List[_TemplateSegment] = []
+    cursor = 0
+    for match in _PLACEHOLDER_PATTERN.finditer(text):
+        key = _extract_placeholder(match)
+        if not key:
+            continue
+        start, end = match.span()
+        if start > cursor:
+            segments.append(text[cursor:start])
+        segments.append((key, match.group(0)))
+        cursor = end
+    if cursor < len(text):
+        segments.append(text[cursor:])
+    return tuple(segments)
+
+
+# Placeholders per live Plan, keyed by id() and evicted by weakref.finalize
+# when the plan is collected. Plans are treated as immutable (every edit goes
+# through model_copy, which yields a new identity), so entries never go stale.
+_PLACEHOLDER_CACHE: Dict[int, FrozenSet[str]] = {}
+
+
+def _remember_placeholders(plan: Plan, placeholders: FrozenSet[str]) -> None:
+    key = id(plan)
+    if key not in _PLACEHOLDER_CACHE:
+        weakref.finalize(plan, _PLACEHOLDER_CACHE.pop, key, None)
+    _PLACEHOLDER_CACHE[key] = placeholders
+
+
 def collect_plan_placeholders(plan: Plan) -> Set[str]:
+    cached = _PLACEHOLDER_CACHE.get(id(plan))
+    if cached is not None:
+        return set(cached)
     placeholders: Set[str] = set()
 
     def scan(text: Optional[str]) -> None:
-        if not text:
+        if not text or "{" not in text:
             return
-        for match in _PLACEHOLDER_PATTERN.finditer(text):
-            key = _extract_placeholder(match)
-            if key:
-                placeholders.add(key)
+        for segment in _compile_template(text):
+            if not isinstance(segment, str):
+                placeholders.add(segment[0])
 
     scan(plan.name)
     for step in plan.steps:
         scan(step.title)
         scan(step.instructions)
+    _remember_placeholders(plan, frozenset(placeholders))
     return placeholders
 
 
+def _same_value(current: Any, new: Any) -> bool:
+    # Stricter than ==: 1, 1.0 and True compare equal but render differently
+    # as variable values, so a change of type must still count as a change.
+    if type(current) is not type(new):
+        return False
+    if isinstance(current, dict):
+        return current.keys() == new.keys() and all(
+            _same_value(value, new[key]) for key, value in current.items()
+        )
+    return current == new
+
+
 def _plan_model_copy(plan: Plan, **updates: Any) -> Plan:
+    # model_copy is already a shallow, validation-free copy that shares the
+    # validated PlanStep objects (cheaper than model_dump + model_construct);
+    # the remaining win is not copying at all when nothing actually changes.
+    if all(_same_value(getattr(plan, key), value) for key, value in updates.items()):
+        return plan
     try:
         return plan.model_copy(update=updates)  # type: ignore[attr-defined]
     except AttributeError:  # pragma: no cover - Pydantic v1 fallback
@@ -214,20 +563,178 @@ def normalize_plan_variables(plan: Plan) -> tuple[Plan, Set[str]]:
         updates["has_variables"] = has_variables
     if updates:
         plan = _plan_model_copy(plan, **updates)
+        # Only vars/has_variables changed, so the copy shares the placeholders.
+        _remember_placeholders(plan, frozenset(placeholders))
     return plan, placeholders
 
 
 def apply_plan_variables(value: Optional[str], vars_map: Dict[str, VarValue]) -> Optional[str]:
-    if value is None:
-        return None
+    if value is None or "{" not in value:
+        return value
+    return "".join(
+        segment
+        if isinstance(segment, str)
+        else (str(vars_map[segment[0]]) if segment[0] in vars_map else segment[1])
+        for segment in _compile_template(value)
+    )
+
+
+def _summarize_key_hold(event: Dict[str, Any], kind: str, ts_text: str) -> str:
+    detail = event.get("combo") or event.get("key") or "key"
+    duration = float(event.get("duration") or 0.0)
+    return f"{ts_text} key_hold {detail} for {duration:0.2f}s"
+
+
+def _summarize_keydown(event: Dict[str, Any], kind: str, ts_text: str) -> str:
+    detail = event.get("combo") or event.get("key") or "key"
+    return f"{ts_text} {kind} {detail}"
+
+
+def _summarize_keyup(event: Dict[str, Any], kind: str, ts_text: str) -> str:
+    return f"{ts_text} keyup {event.get('key')!r}"
+
+
+def _summarize_pointer(event: Dict[str, Any], kind: str, ts_text: str) -> str:
+    x = event.get("x")
+    y = event.get("y")
+    selector = event.get("selector") or ""
+    label = None
+    actionable = event.get("actionable")
+    if isinstance(actionable, dict):
+        label = actionable.get("label") or actionable.get("tag")
+    if not label:
+        element = event.get("element")
+        if isinstance(element, dict):
+            label = element.get("label")
+    button = event.get("button")
+    # Coordinates are coerced here, at the single point of use, rather than
+    # in a separate normalization pass; a missing/non-numeric pair is dropped
+    # instead of failing the whole summary.
+    try:
+        coords = f"({float(x):.1f},{float(y):.1f})"
+    except (TypeError, ValueError):
+        coords = ""
+    detail_parts = [coords]
+    if label:
+        detail_parts.append(f'"{label}"')
+    if selector:
+        detail_parts.append(selector)
+    if button:
+        detail_parts.append(f"button={button}")
+    return f"{ts_text} {kind} on " + " ".join(part for part in detail_parts if part)
+
+
+def _summarize_input(event: Dict[str, Any], kind: str, ts_text: str) -> str:
+    selector = event.get("selector") or ""
+    return f"{ts_text} input on {selector} len={event.get('len')}"
+
+
+# Role-based locators repeat across most events of a recording (the same
+# button is clicked, focused and probed), so the formatted strings are cached:
+# repeats skip formatting and get back the same (bounded) cached object.
+@functools.lru_cache(maxsize=4096)
+def _role_cue(role: str, name: str) -> str:
+    return f'[role={role}] name="{name[:80]}"'
+
+
+@functools.lru_cache(maxsize=4096)
+def _role_candidate(role: str, name: str) -> str:
+    return f'role({role},"{name[:80]}")'
+
+
+@functools.lru_cache(maxsize=4096)
+def _role_dedupe_key(role: str, name: str) -> str:
+    return f"role::{role}::{name.strip()}"
+
+
+# Event kind -> formatter used by PlanSynthesizer._summarize_events. A dict
+# lookup is O(1) per event instead of walking an if/elif chain of string
+# comparisons. Scroll coalescing and the "tab_*" prefix stay in the loop.
+_EVENT_SUMMARIZERS: Dict[str, Callable[[Dict[str, Any], str, str], str]] = {
+    "key_hold": _summarize_key_hold,
+    "keydown": _summarize_keydown,
+    "keydown_repeat": _summarize_keydown,
+    "keyup": _summarize_keyup,
+    "pointerdown": _summarize_pointer,
+    "click": _summarize_pointer,
+    "pointerup": _summarize_pointer,
+    "input": _summarize_input,
+}
 
-    def repl(match: re.Match[str]) -> str:
-        key = _extract_placeholder(match)
-        if key and key in vars_map:
-            return str(vars_map[key])
-        return match.group(0)
 
-    return _PLACEHOLDER_PATTERN.sub(repl, value)
+def _frame_caption(index: int, frame: RecordingFrame) -> str:
+    """Caption sent ahead of each attached frame, shared by both providers."""
+    return f"frame_index={index}, timestamp={frame.timestamp:.2f}s"
+
+
+# Event kinds that contribute observed elements to the prompt's DOM context.
+_DOM_CONTEXT_KINDS: FrozenSet[str] = frozenset(
+    {"click", "drag", "dom_probe", "key_down", "key_up"}
+)
+# Form controls whose name attribute makes a stable locator candidate.
+_NAMED_FIELD_TAGS: FrozenSet[str] = frozenset({"input", "select", "textarea"})
+
+
+class _EventTargets(NamedTuple):
+    """Locator-relevant parts of a recorded event, resolved once per event.
+
+    ``primary_locator`` falls back to the focused element's locator,
+    ``element`` is the actionable/element target and ``target`` additionally
+    falls back to the focus target. Non-dict values are normalised to None so
+    helpers skip their repeated isinstance checks.
+    """
+
+    primary_locator: Optional[Dict[str, Any]]
+    element: Optional[Dict[str, Any]]
+    target: Optional[Dict[str, Any]]
+
+
+def _event_targets(ev: Dict[str, Any]) -> _EventTargets:
+    focus = ev.get("focus")
+    pl = ev.get("primaryLocator")
+    if not pl and isinstance(focus, dict):
+        pl = focus.get("primaryLocator")
+    element = ev.get("actionable") or ev.get("element")
+    target = element or focus
+    return _EventTargets(
+        primary_locator=pl if isinstance(pl, dict) else None,
+        element=element if isinstance(element, dict) else None,
+        target=target if isinstance(target, dict) else None,
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _decode_plan_payload(payload_text: str) -> Dict[str, object]:
+    """Decode and sanity-check a provider plan payload.
+
+    Memoized on the raw text so retries that return the same payload skip the
+    decode. The returned dict is shared between callers and must be treated as
+    read-only (``Plan.model_validate`` copies what it needs). Failures raise and
+    are never cached.
+    """
+    try:
+        parsed = _json_loads(payload_text)
+    except json.JSONDecodeError as exc:
+        logger.error("Failed to decode plan payload: %s", exc)
+        raise RuntimeError("Plan provider returned malformed JSON") from exc
+
+    if not isinstance(parsed, dict):
+        raise RuntimeError("Plan payload must be a JSON object")
+
+    steps = parsed.get("steps")
+    if not isinstance(steps, list) or not steps:
+        raise RuntimeError("Plan must contain at least one step")
+
+    for raw_step in steps:
+        if not isinstance(raw_step, dict):
+            raise RuntimeError("Each step must be a JSON object")
+        instructions = raw_step.get("instructions")
+        if not isinstance(instructions, str) or not instructions.strip():
+            raise RuntimeError(
+                "Each step must include natural language instructions"
+            )
+
+    return parsed
 
 
 @dataclass
@@ -242,7 +749,9 @@ class PlanSynthesisResult:
 class PlanSynthesizer:
     """Produces plan steps using either Gemini 2.5 Pro or ChatGPT 5."""
 
-    SUPPORTED_PROVIDERS = {"gemini", "chatgpt"}
+    SUPPORTED_PROVIDERS = frozenset({"gemini", "chatgpt"})
+    # Frames attached to the synthesis request, per provider.
+    PROVIDER_FRAME_LIMITS = {"gemini": 8, "chatgpt": 6}
 
     def __init__(self) -> None:
         self._enabled = os.environ.get("PLAN_SYNTH_ENABLED") == "1"
@@ -307,13 +816,18 @@ class PlanSynthesizer:
             recording, request.plan_name, request.start_url, request.variable_hints
         )
 
+        # Select the frames once for the chosen provider; the providers only
+        # consume the strided subset, never the full frame list.
+        frames = self._downsample_frames(
+            recording.frames, limit=self.PROVIDER_FRAME_LIMITS[provider]
+        )
         if provider == "gemini":
             plan_payload, raw_response = await self._synthesize_with_gemini(
-                prompt, recording
+                prompt, frames
             )
         else:
             plan_payload, raw_response = await self._synthesize_with_chatgpt(
-                prompt, recording
+                prompt, frames
             )
 
         plan = Plan.model_validate(plan_payload)
@@ -385,6 +899,9 @@ class PlanSynthesizer:
                 return
 
             logger.info("Starting audio transcription...")
+            # The bundle only carries audio as base64 (audioWavBase64 from the
+            # teach client, persisted as-is), so there are no raw bytes to hand
+            # to transcribe_bytes(); transcribe() decodes once and delegates.
             result = await service.transcribe(recording.audio_wav_base64)
 
             if result:
@@ -416,36 +933,12 @@ class PlanSynthesizer:
     async def _synthesize_with_gemini(
         self,
         prompt: str,
-        recording: RecordingBundle,
+        frames: List[RecordingFrame],
     ) -> tuple[Dict[str, Any], str]:
         assert self._gemini_client and self._gemini_types and self._gemini_config
-        parts = [self._gemini_types.Part(text=prompt)]
-
-        for index, frame in enumerate(
-            self._downsample_frames(recording.frames, limit=8)
-        ):
-            try:
-                png_bytes = base64.b64decode(frame.png.encode("ascii"))
-            except ValueError:
-                logger.warning("Skipping malformed PNG for frame index %d", index)
-                continue
-            parts.append(
-                self._gemini_types.Part(
-                    text=f"frame_index={index}, timestamp={frame.timestamp:.2f}s"
-                )
-            )
-            parts.append(
-                self._gemini_types.Part.from_bytes(
-                    data=png_bytes, mime_type="image/png"
-                )
-            )
-
-        response = await asyncio.to_thread(
-            self._gemini_client.models.generate_content,
-            model=self._gemini_model_id,
-            contents=[self._gemini_types.Content(role="user", parts=parts)],
-            config=self._gemini_config,
-        )
+        # Frame decoding rides along in the same worker thread as the blocking
+        # SDK call: one thread hop, and the event loop never sees the base64 work.
+        response = await asyncio.to_thread(self._generate_with_gemini, prompt, frames)
 
         if not response.candidates:
             raise RuntimeError("Gemini returned no candidates")
@@ -455,12 +948,57 @@ class PlanSynthesizer:
         plan_payload = self._parse_payload(plan_json)
         return plan_payload, plan_json
 
+    def _generate_with_gemini(self, prompt: str, frames: List[RecordingFrame]) -> Any:
+        """Build the multimodal request and call Gemini (runs in a worker thread)."""
+        assert self._gemini_client and self._gemini_types and self._gemini_config
+        parts = [self._gemini_types.Part(text=prompt)]
+        for index, frame in enumerate(frames):
+            parts.extend(self._build_frame_parts(index, frame))
+        return self._gemini_client.models.generate_content(
+            model=self._gemini_model_id,
+            contents=[self._gemini_types.Content(role="user", parts=parts)],
+            config=self._gemini_config,
+        )
+
+    def _build_frame_parts(self, index: int, frame: RecordingFrame) -> List[Any]:
+        """Return the (caption, image) Gemini parts for one frame, or [] if malformed."""
+        assert self._gemini_types is not None
+        if len(frame.png) > MAX_FRAME_PNG_BASE64_LEN:
+            logger.warning(
+                "Skipping oversize PNG for frame index %d (%d base64 chars)",
+                index,
+                len(frame.png),
+            )
+            return []
+        try:
+            # a2b_base64 takes the ASCII str directly: no intermediate bytes copy.
+            png_bytes = binascii.a2b_base64(frame.png)
+        except ValueError:
+            logger.warning("Skipping malformed PNG for frame index %d", index)
+            return []
+        return [
+            self._gemini_types.Part(
+                text=_frame_caption(index, frame)
+            ),
+            self._gemini_types.Part.from_bytes(data=png_bytes, mime_type="image/png"),
+        ]
+
     async def _synthesize_with_chatgpt(
         self,
         prompt: str,
-        recording: RecordingBundle,
+        frames: List[RecordingFrame],
     ) -> tuple[Dict[str, Any], str]:
         assert self._openai_client is not None
+        # Like the Gemini path, the multi-MB data-URL strings are assembled in
+        # the worker thread that performs the blocking request.
+        response = await asyncio.to_thread(self._respond_with_chatgpt, prompt, frames)
+
+        plan_payload, raw_response = self._extract_openai_payload(response)
+        return plan_payload, raw_response
+
+    def _respond_with_chatgpt(self, prompt: str, frames: List[RecordingFrame]) -> Any:
+        """Build the multimodal request and call ChatGPT (runs in a worker thread)."""
+        assert self._openai_client is not None
 
         system_prompt = (
             "You are building an automation plan for a web browser agent. "
@@ -469,13 +1007,11 @@ class PlanSynthesizer:
 
         # Build multimodal content (favor 'input_text'; fall back to 'text' if the API complains)
         user_content: List[Dict[str, Any]] = [{"type": "input_text", "text": prompt}]
-        for index, frame in enumerate(
-            self._downsample_frames(recording.frames, limit=6)
-        ):
+        for index, frame in enumerate(frames):
             user_content.append(
                 {
                     "type": "input_text",
-                    "text": f"frame_index={index}, timestamp={frame.timestamp:.2f}s",
+                    "text": _frame_caption(index, frame),
                 }
             )
             user_content.append(
@@ -493,8 +1029,7 @@ class PlanSynthesizer:
             {"role": "user", "content": user_content},
         ]
 
-        response = await asyncio.to_thread(
-            self._openai_client.responses.create,
+        return self._openai_client.responses.create(
             model=self._openai_model_id,
             input=input_payload,
             reasoning={"effort": "medium", "summary": "auto"},
@@ -515,25 +1050,24 @@ class PlanSynthesizer:
             store=True,
         )
 
-        plan_payload, raw_response = self._extract_openai_payload(response)
-        return plan_payload, raw_response
-
-    def _format_locator(self, ev: Dict[str, Any]) -> str:
+    def _format_locator(
+        self, ev: Dict[str, Any], targets: Optional[_EventTargets] = None
+    ) -> str:
         """Format a compact, human-readable locator from event payload."""
-        pl = ev.get("primaryLocator")
-        if not pl and isinstance(ev.get("focus"), dict):
-            pl = ev["focus"].get("primaryLocator")
-        if isinstance(pl, dict):
+        if targets is None:
+            targets = _event_targets(ev)
+        pl = targets.primary_locator
+        if pl is not None:
             if pl.get("by") == "role" and pl.get("role") and pl.get("name"):
-                return f'[role={pl["role"]}] name="{str(pl["name"])[:80]}"'
+                return _role_cue(str(pl["role"]), str(pl["name"]))
             if pl.get("by") == "css" and pl.get("value"):
                 return str(pl["value"])
         # Fallbacks
         sel = ev.get("selector")
         if sel:
             return str(sel)
-        target = ev.get("actionable") or ev.get("element") or ev.get("focus")
-        if isinstance(target, dict):
+        target = targets.target
+        if target is not None:
             tag = str(target.get("tag") or "element").lower()
             nameish = target.get("name") or target.get("label") or ""
             css = target.get("cssPath") or target.get("selector")
@@ -543,9 +1077,87 @@ class PlanSynthesizer:
             return f"{tag}{text}".strip()
         return ""
 
+    def _focus_locator(self, e: Dict[str, Any]) -> str:
+        return self._format_locator({"focus": e.get("focus"), "selector": e.get("selector")})
+
+    def _cue_click(self, e: Dict[str, Any], t: str) -> str:
+        loc = self._format_locator(e)
+        btn = e.get("button", "left")
+        return f"{t} click → {btn}{(' on ' + loc) if loc else ''}"
+
+    def _cue_drag(self, e: Dict[str, Any], t: str) -> str:
+        # Drag events contain start and end coordinates, essential for drawing/positioning actions
+        # Format: "ts drag → (start_x,start_y) to (end_x,end_y) [duration] [on element]"
+        start_x = float(e.get("start_x", 0))
+        start_y = float(e.get("start_y", 0))
+        end_x = float(e.get("end_x", 0))
+        end_y = float(e.get("end_y", 0))
+        duration = float(e.get("duration") or 0.0)
+        btn = e.get("button", "left")
+        # Calculate drag distance for context (one C call, overflow-safe)
+        distance = math.hypot(end_x - start_x, end_y - start_y)
+        # Format end element locator if available
+        end_loc = ""
+        if e.get("end_primaryLocator") or e.get("end_selector"):
+            end_loc = self._format_locator(
+                {
+                    "primaryLocator": e.get("end_primaryLocator"),
+                    "selector": e.get("end_selector"),
+                    "element": e.get("end_element"),
+                }
+            )
+        detail_parts = [
+            f"({start_x:.0f},{start_y:.0f}) → ({end_x:.0f},{end_y:.0f})",
+            f"distance={distance:.0f}px",
+            f"{duration:.2f}s",
+        ]
+        if end_loc:
+            detail_parts.append(f"to {end_loc}")
+        return f"{t} drag → {btn} {' '.join(detail_parts)}"
+
+    def _cue_dom_probe(self, e: Dict[str, Any], t: str) -> str:
+        loc = self._format_locator(e)
+        return f"{t} probe → {loc or 'target'}"
+
+    def _cue_scroll(self, e: Dict[str, Any], t: str) -> str:
+        dx = int(e.get("deltaX") or 0)
+        dy = int(e.get("deltaY") or 0)
+        return f"{t} scroll → Δx={dx}, Δy={dy}"
+
+    def _cue_key_down(self, e: Dict[str, Any], t: str) -> str:
+        combo = e.get("combo") or e.get("key") or ""
+        focus_loc = self._focus_locator(e)
+        return f"{t} key_down → {combo}{(' into ' + focus_loc) if focus_loc else ''}"
+
+    def _cue_key_up(self, e: Dict[str, Any], t: str) -> str:
+        key = e.get("key") or ""
+        focus_loc = self._focus_locator(e)
+        return f"{t} key_up → {key}{(' on ' + focus_loc) if focus_loc else ''}"
+
+    def _cue_key_hold(self, e: Dict[str, Any], t: str) -> str:
+        # Extract the key/combo and duration to show what character was held and for how long
+        # This is critical for understanding typing patterns and repeated characters
+        detail = e.get("combo") or e.get("key") or "key"
+        duration = float(e.get("duration") or 0.0)
+        focus_loc = self._focus_locator(e)
+        return f"{t} key_hold → {detail} for {duration:.2f}s{(' on ' + focus_loc) if focus_loc else ''}"
+
+    # Event kind -> cue formatter; one dict lookup per event replaces the
+    # if/elif chain. Unknown kinds fall back to "<ts> <kind>".
+    _CUE_HANDLERS: Dict[str, Callable[["PlanSynthesizer", Dict[str, Any], str], str]] = {
+        "click": _cue_click,
+        "drag": _cue_drag,
+        "dom_probe": _cue_dom_probe,
+        "scroll": _cue_scroll,
+        "key_down": _cue_key_down,
+        "key_up": _cue_key_up,
+        "key_hold": _cue_key_hold,
+    }
+
     def _build_interaction_cues(self, events: List[Dict[str, Any]]) -> List[str]:
         """Turn raw recorded events into timeline cue strings with semantic targets."""
         cues: List[str] = []
+        handlers = self._CUE_HANDLERS
         for e in events or []:
             try:
                 ts = float(e.get("ts", 0.0))
@@ -553,80 +1165,16 @@ class PlanSynthesizer:
                 ts = 0.0
             t = f"{ts:.3f}s"
             kind = str(e.get("kind") or "")
-            loc = self._format_locator(e)
-            if kind == "click":
-                btn = e.get("button", "left")
-                cues.append(f"{t} click → {btn}{(' on ' + loc) if loc else ''}")
-            elif kind == "drag":
-                # Drag events contain start and end coordinates, essential for drawing/positioning actions
-                # Format: "ts drag → (start_x,start_y) to (end_x,end_y) [duration] [on element]"
-                start_x = e.get("start_x", 0)
-                start_y = e.get("start_y", 0)
-                end_x = e.get("end_x", 0)
-                end_y = e.get("end_y", 0)
-                duration = float(e.get("duration") or 0.0)
-                btn = e.get("button", "left")
-                # Calculate drag distance for context
-                distance = ((end_x - start_x) ** 2 + (end_y - start_y) ** 2) ** 0.5
-                # Format end element locator if available
-                end_loc = ""
-                if e.get("end_primaryLocator") or e.get("end_selector"):
-                    end_loc = self._format_locator(
-                        {
-                            "primaryLocator": e.get("end_primaryLocator"),
-                            "selector": e.get("end_selector"),
-                            "element": e.get("end_element"),
-                        }
-                    )
-                detail_parts = [
-                    f"({start_x:.0f},{start_y:.0f}) → ({end_x:.0f},{end_y:.0f})",
-                    f"distance={distance:.0f}px",
-                    f"{duration:.2f}s",
-                ]
-                if end_loc:
-                    detail_parts.append(f"to {end_loc}")
-                cues.append(f"{t} drag → {btn} {' '.join(detail_parts)}")
-            elif kind == "dom_probe":
-                cues.append(f"{t} probe → {loc or 'target'}")
-            elif kind == "scroll":
-                dx = int(e.get("deltaX") or 0)
-                dy = int(e.get("deltaY") or 0)
-                cues.append(f"{t} scroll → Δx={dx}, Δy={dy}")
-            elif kind == "key_down":
-                combo = e.get("combo") or e.get("key") or ""
-                focus_loc = self._format_locator(
-                    {"focus": e.get("focus"), "selector": e.get("selector")}
-                )
-                cues.append(
-                    f"{t} key_down → {combo}{(' into ' + focus_loc) if focus_loc else ''}"
-                )
-            elif kind == "key_up":
-                key = e.get("key") or ""
-                focus_loc = self._format_locator(
-                    {"focus": e.get("focus"), "selector": e.get("selector")}
-                )
-                cues.append(
-                    f"{t} key_up → {key}{(' on ' + focus_loc) if focus_loc else ''}"
-                )
-            elif kind == "key_hold":
-                # Extract the key/combo and duration to show what character was held and for how long
-                # This is critical for understanding typing patterns and repeated characters
-                key = e.get("key")
-                combo = e.get("combo")
-                duration = float(e.get("duration") or 0.0)
-                detail = combo or key or "key"
-                focus_loc = self._format_locator(
-                    {"focus": e.get("focus"), "selector": e.get("selector")}
-                )
-                cues.append(
-                    f"{t} key_hold → {detail} for {duration:.2f}s{(' on ' + focus_loc) if focus_loc else ''}"
-                )
-            else:
-                cues.append(f"{t} {kind}")
+            handler = handlers.get(kind)
+            cues.append(handler(self, e, t) if handler is not None else f"{t} {kind}")
         return cues
 
-    def _candidate_strings(self, ev: Dict[str, Any]) -> List[str]:
+    def _candidate_strings(
+        self, ev: Dict[str, Any], targets: Optional[_EventTargets] = None
+    ) -> List[str]:
         """Collect locator candidates from an event, deduped and ordered by robustness."""
+        if targets is None:
+            targets = _event_targets(ev)
         out: List[str] = []
         seen: set[str] = set()
 
@@ -639,12 +1187,10 @@ class PlanSynthesizer:
             out.append(s)
 
         # 1) Primary locator first
-        pl = ev.get("primaryLocator")
-        if not pl and isinstance(ev.get("focus"), dict):
-            pl = ev["focus"].get("primaryLocator")
-        if isinstance(pl, dict):
+        pl = targets.primary_locator
+        if pl is not None:
             if pl.get("by") == "role" and pl.get("role") and pl.get("name"):
-                push(f'role({pl["role"]},"{str(pl["name"])[:80]}")')
+                push(_role_candidate(str(pl["role"]), str(pl["name"])))
             if pl.get("by") == "css" and pl.get("value"):
                 push(str(pl["value"]))
 
@@ -655,17 +1201,17 @@ class PlanSynthesizer:
             if c.get("by") == "css" and c.get("value"):
                 push(str(c["value"]))
             elif c.get("by") == "role" and c.get("role") and c.get("name"):
-                push(f'role({c["role"]},"{str(c["name"])[:80]}")')
+                push(_role_candidate(str(c["role"]), str(c["name"])))
 
         # 3) Actionable/element fallbacks: id, name, cssPath
-        target = ev.get("actionable") or ev.get("element") or ev.get("focus")
-        if isinstance(target, dict):
+        target = targets.target
+        if target is not None:
             tid = target.get("id")
             if tid:
                 push(f"#{tid}")
             tname = target.get("name") or target.get("label")
             ttag = (target.get("tag") or "").lower()
-            if ttag in {"input", "select", "textarea"} and tname:
+            if ttag in _NAMED_FIELD_TAGS and tname:
                 push(f'{ttag}[name="{str(tname)[:80]}"]')
             css = target.get("cssPath") or target.get("selector")
             if css:
@@ -687,24 +1233,22 @@ class PlanSynthesizer:
         bullets: List[str] = []
         seen_keys: set[str] = set()
 
-        def key_for(ev: Dict[str, Any]) -> Optional[str]:
-            pl = ev.get("primaryLocator")
-            if not pl and isinstance(ev.get("focus"), dict):
-                pl = ev["focus"].get("primaryLocator")
+        def key_for(ev: Dict[str, Any], targets: _EventTargets) -> Optional[str]:
+            pl = targets.primary_locator
             if (
-                isinstance(pl, dict)
+                pl is not None
                 and pl.get("by") == "role"
                 and pl.get("role")
                 and pl.get("name")
             ):
-                return f'role::{pl["role"]}::{str(pl["name"]).strip()}'
-            if isinstance(pl, dict) and pl.get("by") == "css" and pl.get("value"):
+                return _role_dedupe_key(str(pl["role"]), str(pl["name"]))
+            if pl is not None and pl.get("by") == "css" and pl.get("value"):
                 return f'css::{str(pl["value"])}'
             sel = ev.get("selector")
             if sel:
                 return f"css::{str(sel)}"
-            tgt = ev.get("actionable") or ev.get("element")
-            if isinstance(tgt, dict):
+            tgt = targets.element
+            if tgt is not None:
                 nameish = tgt.get("name") or tgt.get("label") or ""
                 tag = (tgt.get("tag") or "").lower()
                 cssp = tgt.get("cssPath") or ""
@@ -713,39 +1257,36 @@ class PlanSynthesizer:
 
         for e in events or []:
             # Collect DOM context from all interactive events including drag operations
-            if e.get("kind") not in {"click", "drag", "dom_probe", "key_down", "key_up"}:
+            if e.get("kind") not in _DOM_CONTEXT_KINDS:
                 continue
-            k = key_for(e)
+            targets = _event_targets(e)
+            k = key_for(e, targets)
             if not k or k in seen_keys:
                 continue
             seen_keys.add(k)
 
             # Human-facing header
-            tgt = e.get("actionable") or e.get("element") or e.get("focus") or {}
-            tag = (
-                (tgt.get("tag") or "element").lower()
-                if isinstance(tgt, dict)
-                else "element"
-            )
-            role = (tgt.get("role") or "").lower() if isinstance(tgt, dict) else ""
+            tgt = targets.target
+            tag = "element"
+            role = ""
             nameish = ""
-            if isinstance(tgt, dict):
+            if tgt is not None:
+                tag = (tgt.get("tag") or "element").lower()
+                role = (tgt.get("role") or "").lower()
                 nameish = (
                     tgt.get("name") or tgt.get("label") or tgt.get("ariaLabel") or ""
                 )
-            header = f"{tag}"
-            if role:
-                header += f" [role={role}]"
-            if nameish:
-                header += f' name="{str(nameish)[:80]}"'
+            role_part = f" [role={role}]" if role else ""
+            name_part = f' name="{str(nameish)[:80]}"' if nameish else ""
+            header = f"{tag}{role_part}{name_part}"
 
             # Candidates list
-            cands = self._candidate_strings(e)
+            cands = self._candidate_strings(e, targets)
             if cands:
                 bullets.append(f"- {header} | candidates: " + ", ".join(cands))
             else:
                 css = (
-                    (tgt.get("cssPath") if isinstance(tgt, dict) else None)
+                    (tgt.get("cssPath") if tgt is not None else None)
                     or e.get("selector")
                     or ""
                 )
@@ -763,166 +1304,22 @@ class PlanSynthesizer:
         start_url: Optional[str],
         variable_hints: Optional[str] = None,
     ) -> str:
-        markers = sorted(recording.markers, key=lambda marker: marker.timestamp)
+        markers = sorted(recording.markers, key=_BY_TIMESTAMP)
         marker_lines = [
             f"- t={marker.timestamp:.2f}s :: {marker.label or 'Marked step'}"
             for marker in markers
         ]
-        timeline_lines = self._summarize_events(recording.events, limit=2_000)
+        events = recording.events or []
         normalized_start_url = (start_url or "").strip()
 
+        # The static blocks are joined once at import; only dynamic sections
+        # are assembled per call.
         prompt_lines = [
-            "You are building an automation plan for Gemini Computer Use.",
-            "Your goal is to create ATOMIC, SINGLE-ACTION instructions where each step performs exactly ONE discrete action.",
-            "",
-            "Return strict JSON following this schema:",
-            json.dumps(
-                {
-                    "name": plan_name or "recorded run",
-                    "startUrl": normalized_start_url or "",
-                    "vars": {"example": ""},
-                    "steps": [
-                        {
-                            "id": "s1",
-                            "title": "Human readable summary of what happens",
-                            "instructions": "Natural language guidance for the Computer Use agent (full sentences).",
-                        }
-                    ],
-                },
-                ensure_ascii=False,
-            ),
-            "",
-            "CRITICAL: The 'name' field is the OVERALL GOAL of this automation.",
-            "- Analyze the recording and infer what the user is trying to accomplish",
-            "- Write a descriptive name that captures the intent (e.g., 'Draw hi on tldraw', 'Search for flights to Paris', 'Create new document')",
-            "- This name will be shown to the user and to the AI agent as the overall goal",
-            "- DO NOT use generic names like 'Captured flow' or 'recorded run'",
-            "- Keep it concise (≤ 60 chars) but meaningful",
-            "",
-            "CRITICAL INSTRUCTION STYLE - ONE ACTION PER STEP:",
-            "- Each step must contain EXACTLY ONE discrete action (one click, one type, one drag, one scroll, etc.)",
-            "- NEVER combine multiple actions in a single step (e.g., 'Click X and then type Y' is WRONG - split into 2 steps)",
-            "- NEVER write compound instructions like 'Select tool and draw shape' - split into separate steps",
-            "- Each instruction should map to exactly ONE Computer Use action call",
-            '- Good: Step 1: "Click the pen tool button", Step 2: "Draw a line on the canvas"',
-            '- Bad: "Select the pen tool and draw a line" (this is 2 actions, needs 2 steps)',
-            "- Focus on WHAT needs to be achieved in this single action, not HOW to click specific elements",
-            '- Example: "Click the pen tool button in the toolbar" (single click action)',
-            '- Example: "Type the search term into the search box" (single type action)',
-            '- Example: "Draw a horizontal line on the canvas" (single drag action)',
-            "- Let the Computer Use agent figure out the specific UI coordinates",
-            "- Instructions should work even if the UI layout changes slightly",
-            "",
-            "NAVIGATION RULES:",
-            "- The startUrl will be loaded AUTOMATICALLY before any steps execute",
-            "- DO NOT include navigation instructions in the first step (e.g., 'Open [site]', 'Navigate to [url]')",
-            "- The user is ALREADY on the startUrl when step 1 begins",
-            "- Start directly with the first meaningful action (e.g., 'Select the pen tool', not 'Open tldraw and select...')",
-            "",
-            "Rules:",
-            "- Use deterministic step IDs 's1', 's2', ... in chronological order.",
-            "- ATOMIC STEPS: Each step = ONE action only. Never combine multiple actions (click + type, select + drag, etc.).",
-            "- If the user performs multiple interactions, create multiple steps - one per interaction.",
-            "- Align step boundaries to the provided markers (1:1 in order) when markers exist.",
-            "- Keep step IDs stable and human-readable titles short (≤ 80 chars).",
-            "- Infer the USER'S INTENT for each individual action from the interaction timeline.",
-            "- Each step instruction should describe ONE concrete action:",
-            "  • ONE click → 'Click the [button/link name]'",
-            "  • ONE drag → 'Draw [shape/line description] on the canvas'",
-            "  • ONE type → 'Type {variable} into the [field name]'",
-            "  • ONE scroll → 'Scroll down the page'",
-            "  • ONE key press → 'Press Enter to submit'",
-            "- WRONG: 'Click the text box and type your name' (2 actions → needs 2 steps)",
-            "- RIGHT: Step 1: 'Click the name input field', Step 2: 'Type {userName} into the field'",
-            '- When referencing UI elements, quote the visible label or role when available (e.g., "Click the \'Search\' button", "Click the \'Settings\' menu") and avoid low-level selectors.',
-            "- Explicitly call out key presses as separate steps (e.g., pressing Enter or shortcuts).",
-            "- Whenever you mention text the user typed that should remain flexible (like names, emails, greetings), replace the literal with a variable placeholder {variableName} and record that variable in vars.",
-            "- Apply the same placeholder rule to the overall plan name and each step title/instruction; never hard-code sample values if a variable exists.",
-            "- Avoid raw x,y coordinates completely unless absolutely necessary for drawing/positioning.",
-            '- Always include the top-level startUrl as a string; use an empty string ("") if unknown.',
-            "- When you reference a plan variable use the {var} notation and register it under vars.",
-            '- All entries in vars must be strings (coerce numbers to strings).',
-            "- Each step describes exactly ONE action with a clear, concise outcome.",
-            "- Write instructions that are resilient to minor UI changes but still atomic.",
-            "",
-            "=== GEMINI COMPUTER USE ACTIONS (CRITICAL) ===",
-            "The agent executing this plan has access to the following Computer Use actions.",
-            "Your step instructions MUST reference these actions when describing what needs to be done:",
-            "",
-            "NAVIGATION:",
-            '  • navigate(url) - Go directly to a URL: "Navigate to https://example.com"',
-            '  • open_web_browser() - Open browser: "Open the web browser"',
-            '  • go_back() / go_forward() - Browser navigation: "Go back to the previous page"',
-            '  • search() - Open search engine: "Open Google search"',
-            "",
-            "INTERACTION:",
-            '  • click_at(x, y) - Click at coordinates: "Click the submit button"',
-            '  • hover_at(x, y) - Hover for menus: "Hover over the File menu to reveal options"',
-            '  • type_text_at(x, y, text, press_enter, clear_before_typing) - Type text: "Type \'{searchTerm}\' into the search box and press Enter"',
-            '  • key_combination(keys) - Press keyboard shortcuts: "Press Control+A to select all" or "Press Enter to submit"',
-            "",
-            "SCROLLING:",
-            '  • scroll_document(direction) - Scroll the page: "Scroll down to see more results"',
-            '  • scroll_at(x, y, direction, magnitude) - Scroll specific element: "Scroll down within the chat window"',
-            "",
-            "DRAG AND DRAW:",
-            '  • drag_and_drop(x, y, destination_x, destination_y) - Drag from one point to another',
-            '    - Use for DRAWING: "Draw a line/shape on the canvas" (maps to drag motion)',
-            '    - Use for REPOSITIONING: "Drag the slider to adjust volume"',
-            '    - Use for DRAG-DROP: "Drag the file to the upload area"',
-            "",
-            "TIMING:",
-            '  • wait_5_seconds() - Wait for content to load: "Wait for the page to finish loading"',
-            "",
-            "INSTRUCTION MAPPING EXAMPLES (ATOMIC: each recorded interaction → ONE step):",
-            "",
-            "  Example 1 - Drawing workflow (BAD: compound vs GOOD: atomic):",
-            '  Recorded: "2.1s click → pen tool button"',
-            '            "2.5s drag → (200,300) → (450,320)"',
-            "",
-            '  ❌ BAD (combines 2 actions): "Select pen tool and draw a line"',
-            '  ✓ GOOD (atomic steps):',
-            '    Step 1: "Click the pen tool button in the toolbar"',
-            '    Step 2: "Draw a horizontal line on the canvas"',
-            "",
-            "  Example 2 - Form submission (BAD vs GOOD):",
-            '  Recorded: "3.1s click → input field"',
-            '            "3.2s-3.8s key_hold → typing \'hello\'"',
-            '            "4.0s click → submit button"',
-            "",
-            '  ❌ BAD (combines 3 actions): "Enter {greeting} and submit the form"',
-            '  ✓ GOOD (atomic steps):',
-            '    Step 1: "Click the text input field"',
-            '    Step 2: "Type {greeting} into the input field"',
-            '    Step 3: "Click the Submit button"',
-            "",
-            "  Example 3 - Search workflow (BAD vs GOOD):",
-            '  Recorded: "1.5s click → search box"',
-            '            "2.0s-2.5s typing"',
-            '            "2.6s key_down → Enter"',
-            "",
-            '  ❌ BAD (combines 3 actions): "Search for {searchTerm}"',
-            '  ✓ GOOD (atomic steps):',
-            '    Step 1: "Click the search box"',
-            '    Step 2: "Type {searchTerm} into the search box"',
-            '    Step 3: "Press Enter to search"',
-            "",
-            "  REMEMBER: ONE interaction event = ONE step instruction!",
-            "",
-            "CRITICAL DRAG INSTRUCTION RULES:",
-            "- When you see DRAG events in the timeline, analyze the context:",
-            '  • If on a DRAWING canvas (tldraw, whiteboard, etc.) → "Draw [shape/text] on the canvas"',
-            '  • If moving a UI element (slider, resize handle) → "Adjust the [element] by dragging"',
-            '  • If dragging between containers → "Drag the [item] to [destination]"',
-            "- The agent will automatically use drag_and_drop() with the appropriate coordinates",
-            "- DO NOT write rigid instructions like \"Drag from (100,200) to (500,600)\"",
-            '- INSTEAD write intent: "Draw the letter \'h\' on the canvas" or "Slide the volume control to maximum"',
-            "",
-            'Write instructions in natural language that express INTENT and reference the actions above.',
-            'The Computer Use agent will map your instructions to the appropriate action based on context.',
+            _PROMPT_INTRO,
+            _render_plan_skeleton(plan_name or "recorded run", normalized_start_url),
+            _PROMPT_RULES,
         ]
 
-        normalized_start_url = (start_url or "").strip()
         if normalized_start_url:
             prompt_lines.append(
                 f"Initial start URL (load this page before following the steps): {normalized_start_url}"
@@ -930,14 +1327,15 @@ class PlanSynthesizer:
 
         # Include user's variable hints if provided
         if variable_hints and variable_hints.strip():
-            prompt_lines.append("")
-            prompt_lines.append("IMPORTANT: User-provided instructions for variable creation:")
-            prompt_lines.append(variable_hints.strip())
-            prompt_lines.append(
-                "Follow these instructions carefully when deciding which values to parameterize. "
-                "Identify the relevant values from the recording and create appropriately named variables."
+            prompt_lines.extend(
+                (
+                    "",
+                    "IMPORTANT: User-provided instructions for variable creation:",
+                    variable_hints.strip(),
+                    _PROMPT_VARIABLE_HINTS_FOLLOWUP,
+                    "",
+                )
             )
-            prompt_lines.append("")
 
         if marker_lines:
             prompt_lines.append("Markers collected during teaching:")
@@ -946,54 +1344,24 @@ class PlanSynthesizer:
                 "Create one step per marker in the same order when possible."
             )
 
-        timeline_lines = self._summarize_events(
-            recording.events, limit=2_000
-        )  # legacy fallback
-
         # Prefer enriched cues built from recorded events (role/name/selector), fall back to legacy summary
         try:
-            interaction_lines = self._build_interaction_cues(recording.events or [])
+            interaction_lines = self._build_interaction_cues(events)
         except Exception:
             interaction_lines = []
 
-        lines_to_use = interaction_lines or timeline_lines
+        # Only the legacy summary is capped (it islices to the limit itself);
+        # cues and DOM context see every recorded event.
+        lines_to_use = interaction_lines or self._summarize_events(
+            events, limit=MAX_PROMPT_EVENTS
+        )
         if lines_to_use:
-            prompt_lines.append("")
-            prompt_lines.append("Interaction timeline (chronological, already normalized into high-level cues):")
-            prompt_lines.append("")
-            prompt_lines.append("IMPORTANT: Analyze these interactions to INFER THE USER'S GOAL.")
-            prompt_lines.append("Ask yourself:")
-            prompt_lines.append("- What is the user trying to accomplish?")
-            prompt_lines.append("- What tool/feature are they trying to use?")
-            prompt_lines.append("- What content are they creating or modifying?")
-            prompt_lines.append("- What is the end result they want?")
-            prompt_lines.append("")
-            prompt_lines.append("Then write ONE ATOMIC step for each distinct interaction you identify.")
-            prompt_lines.append("")
-            prompt_lines.append("MAP EACH INTERACTION TO ONE STEP (ATOMIC MAPPING):")
-            prompt_lines.append('• Each CLICK event → ONE step with click_at() action:')
-            prompt_lines.append('  - "Click the [button/link name]"')
-            prompt_lines.append('  - Example: If user clicks field then button, create 2 separate steps')
-            prompt_lines.append('• Each DRAG event → ONE step with drag_and_drop() action:')
-            prompt_lines.append('  - Drawing context: "Draw [description] on the canvas"')
-            prompt_lines.append('  - UI manipulation: "Drag the [slider/control] to adjust"')
-            prompt_lines.append('• Each TYPING sequence → ONE step with type_text_at() action:')
-            prompt_lines.append('  - "Type \'{variableName}\' into the [field]"')
-            prompt_lines.append('  - Do NOT combine clicking the field + typing into one step')
-            prompt_lines.append('• Each KEY_PRESS event (Enter, shortcuts) → ONE step with key_combination() action:')
-            prompt_lines.append('  - "Press Enter to submit"')
-            prompt_lines.append('  - "Press Control+A to select all"')
-            prompt_lines.append('• Each SCROLL event → ONE step with scroll action:')
-            prompt_lines.append('  - "Scroll down the page"')
-            prompt_lines.append("")
-            prompt_lines.append("CRITICAL: If you see 5 interactions in the timeline, you should create ~5 steps (one per interaction).")
-            prompt_lines.append("Never merge multiple interactions into a single compound step!")
-            prompt_lines.append("")
+            prompt_lines.append(_PROMPT_TIMELINE_GUIDANCE)
             prompt_lines.extend(lines_to_use)
 
         # Add a compact DOM context snapshot so the model can reference robust locators
         try:
-            dom_bullets = self._collect_dom_context(recording.events or [], limit=16)
+            dom_bullets = self._collect_dom_context(events, limit=16)
         except Exception:
             dom_bullets = []
         if dom_bullets:
@@ -1003,36 +1371,11 @@ class PlanSynthesizer:
             prompt_lines.extend(dom_bullets)
 
         if recording.transcript:
-            prompt_lines.append("")
-            prompt_lines.append("USER NARRATION (voice-over recorded during the session):")
-            prompt_lines.append("")
-            prompt_lines.append("The user narrated their actions while recording. Use this to understand:")
-            prompt_lines.append("- The INTENT behind each action (what they're trying to accomplish)")
-            prompt_lines.append("- Variable names they mention verbally (e.g., 'username', 'password', 'search term')")
-            prompt_lines.append("- Business logic and reasoning for the workflow")
-            prompt_lines.append("- Context for ambiguous UI interactions")
-            prompt_lines.append("- Correlate timestamps with interaction timeline to see what was said during each action")
-            prompt_lines.append("")
-            prompt_lines.append(recording.transcript.strip())
-            prompt_lines.append("")
-
-        prompt_lines.append("")
-        prompt_lines.append("FINAL REMINDERS:")
-        prompt_lines.append("1. Set a DESCRIPTIVE 'name' that captures what the user is trying to accomplish.")
-        prompt_lines.append("2. Create ATOMIC steps - ONE action per step, NEVER combine multiple actions.")
-        prompt_lines.append("3. Count interactions in the timeline and create approximately the same number of steps.")
-        prompt_lines.append("4. Replace literal typed strings with variable placeholders {varName} everywhere (name, steps, instructions) if they should be provided at runtime.")
-        prompt_lines.append("5. Mention the button/link labels or field names the user interacted with (as seen in the cues).")
-        prompt_lines.append("6. Each step instruction describes ONE concrete action that maps to ONE Computer Use API call.")
-        prompt_lines.append("7. Use flexible element descriptions, not rigid CSS selectors.")
-        prompt_lines.append("8. DO NOT include 'Open [site]' or 'Navigate to [url]' in steps - the startUrl loads automatically.")
-        prompt_lines.append("")
-        prompt_lines.append("ATOMIC STEP CHECKLIST:")
-        prompt_lines.append("- Can this step be split into 2+ actions? → If yes, SPLIT IT")
-        prompt_lines.append('- Does the instruction contain "and", "then", or "after"? → If yes, LIKELY needs splitting')
-        prompt_lines.append("- Would the Computer Use agent need to call 2+ APIs for this step? → If yes, SPLIT IT")
-        prompt_lines.append("")
-        prompt_lines.append("Respond with JSON only. Do not add commentary.")
+            prompt_lines.extend(
+                (_PROMPT_NARRATION_GUIDANCE, recording.transcript.strip(), "")
+            )
+
+        prompt_lines.append(_PROMPT_FINAL_REMINDERS)
         return "\n".join(prompt_lines)
 
     @staticmethod
@@ -1045,9 +1388,8 @@ class PlanSynthesizer:
         scroll_ts: Optional[str] = None
 
         def flush_scroll() -> None:
+            # Callers only invoke this with a non-zero pending delta.
             nonlocal scroll_dx, scroll_dy, scroll_ts
-            if scroll_dx == 0 and scroll_dy == 0:
-                return
             ts_text = scroll_ts or "?"
             parts: List[str] = []
             if scroll_dy:
@@ -1062,86 +1404,63 @@ class PlanSynthesizer:
             scroll_dy = 0
             scroll_ts = None
 
-        for event in events[:limit]:
-            kind = str(event.get("kind") or "")
-            ts_value = event.get("ts")
+        # Hot loop (up to MAX_PROMPT_EVENTS iterations): bind bound methods to
+        # locals once so each event skips the repeated attribute lookups.
+        lines_append = lines.append
+        summarizers_get = _EVENT_SUMMARIZERS.get
+        format_ts = "{:06.3f}s".format
+        for event in islice(events, limit):
+            get = event.get
+            kind = str(get("kind") or "")
+            ts_value = get("ts")
             try:
-                ts = float(ts_value)
-                ts_text = f"{ts:06.3f}s"
+                ts_text = format_ts(float(ts_value))
             except (TypeError, ValueError):
                 ts_text = str(ts_value) if ts_value is not None else "?"
 
             if kind == "scroll":
-                delta_x = int(event.get("deltaX") or 0)
-                delta_y = int(event.get("deltaY") or 0)
-                scroll_dx += delta_x
-                scroll_dy += delta_y
+                scroll_dx += int(get("deltaX") or 0)
+                scroll_dy += int(get("deltaY") or 0)
                 scroll_ts = scroll_ts or ts_text
                 continue
 
-            flush_scroll()
-
-            if kind == "key_hold":
-                key = event.get("key")
-                combo = event.get("combo")
-                duration = float(event.get("duration") or 0.0)
-                detail = combo or key or "key"
-                lines.append(f"{ts_text} key_hold {detail} for {duration:0.2f}s")
-                continue
+            # Inline guard: most events follow no pending scroll, so skip the
+            # closure call entirely in the common case.
+            if scroll_dx or scroll_dy:
+                flush_scroll()
 
-            if kind in {"keydown", "keydown_repeat"}:
-                key = event.get("key")
-                combo = event.get("combo")
-                detail = combo or key or "key"
-                lines.append(f"{ts_text} {kind} {detail}")
-                continue
-
-            if kind == "keyup":
-                key = event.get("key")
-                lines.append(f"{ts_text} keyup {key!r}")
-                continue
-
-            if kind in {"pointerdown", "click", "pointerup"}:
-                x = event.get("x")
-                y = event.get("y")
-                selector = event.get("selector") or ""
-                actionable = event.get("actionable") or {}
-                label = None
-                if isinstance(actionable, dict):
-                    label = actionable.get("label") or actionable.get("tag")
-                if not label and isinstance(event.get("element"), dict):
-                    label = event["element"].get("label")
-                button = event.get("button")
-                detail_parts = [f"({x:.1f},{y:.1f})"]
-                if label:
-                    detail_parts.append(f'"{label}"')
-                if selector:
-                    detail_parts.append(selector)
-                if button:
-                    detail_parts.append(f"button={button}")
-                lines.append(
-                    f"{ts_text} {kind} on "
-                    + " ".join(part for part in detail_parts if part)
-                )
-                continue
-
-            if kind == "input":
-                selector = event.get("selector") or ""
-                length = event.get("len")
-                lines.append(f"{ts_text} input on {selector} len={length}")
+            summarizer = summarizers_get(kind)
+            if summarizer is not None:
+                lines_append(summarizer(event, kind, ts_text))
                 continue
 
             if kind.startswith("tab_"):
-                title = event.get("title") or ""
-                url = event.get("url") or ""
-                lines.append(f"{ts_text} {kind} {title} {url}".strip())
+                title = get("title") or ""
+                url = get("url") or ""
+                lines_append(f"{ts_text} {kind} {title} {url}".strip())
                 continue
 
-            lines.append(f"{ts_text} {kind} {event}")
+            lines_append(f"{ts_text} {kind} {event}")
 
-        flush_scroll()
+        if scroll_dx or scroll_dy:
+            flush_scroll()
         return lines
 
+    @staticmethod
+    def _downsample_indices(count: int, *, limit: int) -> Sequence[int]:
+        """Evenly spread frame indices from first to last: pure integer math.
+
+        Integer equivalent of ``linspace(0, count - 1, limit)``, so the sample
+        always spans the whole recording instead of a floor-stride prefix.
+        """
+        if count <= limit:
+            return range(count)
+        if limit <= 1:
+            return range(min(count, limit))
+        last = count - 1
+        span = limit - 1
+        return [k * last // span for k in range(limit)]
+
     @staticmethod
     def _downsample_frames(
         frames: List[RecordingFrame],
@@ -1150,15 +1469,18 @@ class PlanSynthesizer:
     ) -> List[RecordingFrame]:
         if len(frames) <= limit:
             return frames
-        step = max(1, len(frames) // limit)
-        return frames[::step][:limit]
+        return [
+            frames[i]
+            for i in PlanSynthesizer._downsample_indices(len(frames), limit=limit)
+        ]
 
     def _extract_candidate_text(self, candidate) -> str:  # type: ignore[no-untyped-def]
         parts = getattr(candidate.content, "parts", []) or []
         chunks = [
             getattr(part, "text", "") for part in parts if getattr(part, "text", None)
         ]
-        combined = "\n".join(chunk.strip() for chunk in chunks if chunk.strip())
+        stripped = (chunk.strip() for chunk in chunks)
+        combined = "\n".join(chunk for chunk in stripped if chunk)
         if not combined:
             raise RuntimeError("Gemini candidate response did not contain text")
         if self._debug:
@@ -1166,29 +1488,7 @@ class PlanSynthesizer:
         return combined
 
     def _parse_payload(self, payload_text: str) -> Dict[str, object]:
-        try:
-            parsed = json.loads(payload_text)
-        except json.JSONDecodeError as exc:
-            logger.error("Failed to decode plan payload: %s", exc)
-            raise RuntimeError("Plan provider returned malformed JSON") from exc
-
-        if not isinstance(parsed, dict):
-            raise RuntimeError("Plan payload must be a JSON object")
-
-        steps = parsed.get("steps")
-        if not isinstance(steps, list) or not steps:
-            raise RuntimeError("Plan must contain at least one step")
-
-        for raw_step in steps:
-            if not isinstance(raw_step, dict):
-                raise RuntimeError("Each step must be a JSON object")
-            instructions = raw_step.get("instructions")
-            if not isinstance(instructions, str) or not instructions.strip():
-                raise RuntimeError(
-                    "Each step must include natural language instructions"
-                )
-
-        return parsed
+        return _decode_plan_payload(payload_text)
 
     def _extract_openai_payload(self, response):
         """
@@ -1215,19 +1515,19 @@ class PlanSynthesizer:
                 raise ValueError(
                     "OpenAI response had no output_parsed and no output_text to parse."
                 )
-            plan_payload = json.loads(text)
+            plan_payload = _json_loads(text)
 
         # 3) Raw response for logs – make sure to CALL model_dump()/model_dump_json()
         if hasattr(response, "model_dump_json"):
             raw_response = response.model_dump_json(exclude_none=True)  # <- JSON string
         elif hasattr(response, "model_dump"):
-            raw_response = json.dumps(
-                response.model_dump(exclude_none=True), ensure_ascii=False
-            )
+            raw_response = _json_dumps(response.model_dump(exclude_none=True))
         else:
-            # Very old SDKs: try a generic to_json()/dict conversion
-            raw_response = json.dumps(
-                json.loads(response.to_json()), ensure_ascii=False
+            # Very old SDKs: to_json() already yields JSON text, so keep it
+            # as-is instead of decoding and re-encoding it.
+            raw_json = response.to_json()
+            raw_response = (
+                raw_json.decode() if isinstance(raw_json, bytes) else str(raw_json)
             )
 
         return plan_payload, raw_response
@@ -1244,13 +1544,14 @@ class PlanSynthesizer:
         if not recording.frames or not plan.steps:
             return {}
 
-        # Build arrays of (ts, png)
-        frame_ts = [float(f.timestamp) for f in recording.frames]
-        frame_png = [f.png for f in recording.frames]
+        # Only timestamps are needed up front; PNG payloads are looked up per
+        # chosen index, so steps that share a frame share one string reference.
+        frames = recording.frames
+        frame_ts = [float(f.timestamp) for f in frames]
 
         # Target timestamps per step
         if recording.markers:
-            markers_sorted = sorted(recording.markers, key=lambda m: float(m.timestamp))
+            markers_sorted = sorted(recording.markers, key=_BY_TIMESTAMP)
             target_ts = [float(m.timestamp) for m in markers_sorted][: len(plan.steps)]
         else:
             # Evenly spread across the observed time range
@@ -1259,30 +1560,32 @@ class PlanSynthesizer:
             if end_ts <= start_ts:
                 target_ts = [start_ts for _ in plan.steps]
             else:
-                span = end_ts - start_ts
-                target_ts = [
-                    start_ts + (i * (span / max(1, len(plan.steps) - 1)))
-                    for i in range(len(plan.steps))
-                ]
+                step_count = len(plan.steps)
+                step_dt = (end_ts - start_ts) / max(1, step_count - 1)
+                target_ts = [start_ts + i * step_dt for i in range(step_count)]
+
+        # For each target timestamp, choose nearest frame index (earliest on ties).
+        # Frames arrive in capture order, so a binary search makes this
+        # O(steps · log frames); an out-of-order bundle falls back to a scan.
+        frames_sorted = all(a <= b for a, b in zip(frame_ts, frame_ts[1:]))
 
-        # For each target timestamp, choose nearest frame index
         def nearest_index(ts: float) -> int:
-            # Linear search is fine (frames are already limited for synthesis); keep simple/robust
-            best_i = 0
-            best_d = float("inf")
-            for i, fts in enumerate(frame_ts):
-                d = abs(fts - ts)
-                if d < best_d:
-                    best_d = d
-                    best_i = i
-            return best_i
+            if not frames_sorted:
+                return min(range(len(frame_ts)), key=lambda i: abs(frame_ts[i] - ts))
+            i = bisect.bisect_left(frame_ts, ts)
+            if i == 0:
+                return 0
+            if i == len(frame_ts) or ts - frame_ts[i - 1] <= frame_ts[i] - ts:
+                # Step back to the first of any run of equal timestamps.
+                return bisect.bisect_left(frame_ts, frame_ts[i - 1])
+            return i
 
         mapping: Dict[str, List[Dict[str, Any]]] = {}
         for i, step in enumerate(plan.steps):
             idx = nearest_index(target_ts[i] if i < len(target_ts) else frame_ts[-1])
             # Single primary reference for now; can add neighborhood frames later if needed
             label = step.title
-            mapping[step.id] = [{"png_base64": frame_png[idx], "label": label}]
+            mapping[step.id] = [{"png_base64": frames[idx].png, "label": label}]
         return mapping
 
     def _persist_step_checkpoints(
@@ -13,21 +13,88 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import functools
 import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from io import BytesIO
 from typing import Any, Dict, List, Optional
 
+try:  # pragma: no cover - optional SIMD base64 decoder; stdlib is the fallback
+    import pybase64  # type: ignore
+except ImportError:  # pragma: no cover
+    pybase64 = None  # type: ignore
+
 logger = logging.getLogger(__name__)
 
+# Audio payloads run to megabytes of base64, so prefer the vectorized decoder
+# when it is installed. Both accept the same arguments and return bytes.
+_b64decode = pybase64.b64decode if pybase64 is not None else base64.b64decode
+
 # ElevenLabs API configuration
 DEFAULT_CHUNK_WINDOW = float(os.environ.get("TRANSCRIPTION_CHUNK_WINDOW", "5.0"))
 ENABLE_TRANSCRIPTION = os.environ.get("ENABLE_TRANSCRIPTION", "1") == "1"
 TRANSCRIPTION_LANGUAGE = os.environ.get("TRANSCRIPTION_LANGUAGE", "eng")  # Use 'eng' format for SDK
+# Decoded WAV payloads smaller than this (e.g. a bare 44-byte header from a
+# silent session) carry no speech worth an STT round-trip.
+TRANSCRIPTION_MIN_BYTES = int(os.environ.get("TRANSCRIPTION_MIN_BYTES", "1024"))
+TRANSCRIPTION_MAX_WORKERS = max(1, int(os.environ.get("TRANSCRIPTION_MAX_WORKERS", "4")))
+# Client-side pacing for ElevenLabs STT: requests per minute (0 disables) and
+# how many times a 429 "Too many requests" is retried with exponential backoff.
+TRANSCRIPTION_RATE_PER_MINUTE = float(os.environ.get("TRANSCRIPTION_RATE_PER_MINUTE", "30"))
+TRANSCRIPTION_MAX_RETRIES = max(0, int(os.environ.get("TRANSCRIPTION_MAX_RETRIES", "2")))
+TRANSCRIPTION_RETRY_BASE_DELAY = float(os.environ.get("TRANSCRIPTION_RETRY_BASE_DELAY", "2.0"))
+
+# Dedicated pool for the blocking SDK call when only the sync ElevenLabs client
+# is available. Each upload holds a thread for tens of seconds; keeping them
+# off asyncio's default executor means a burst of transcriptions can't starve
+# the storage layer's asyncio.to_thread work. Threads are created lazily, so
+# an idle, async-client or disabled service costs nothing.
+_STT_EXECUTOR = ThreadPoolExecutor(
+    max_workers=TRANSCRIPTION_MAX_WORKERS, thread_name_prefix="stt"
+)
+
+
+class _AsyncTokenBucket:
+    """Minimal asyncio token bucket: ``rate`` acquisitions per ``period`` seconds.
+
+    Starts full, so a short burst up to ``rate`` goes straight through; after
+    that callers wait for tokens to refill instead of hitting the API's cap.
+    """
 
-
-@dataclass
+    def __init__(self, rate: float, period: float = 60.0) -> None:
+        self._capacity = rate
+        self._tokens = rate
+        self._fill_rate = rate / period
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity,
+                    self._tokens + (now - self._updated) * self._fill_rate,
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._fill_rate)
+
+
+_STT_RATE_LIMITER: Optional[_AsyncTokenBucket] = (
+    _AsyncTokenBucket(TRANSCRIPTION_RATE_PER_MINUTE)
+    if TRANSCRIPTION_RATE_PER_MINUTE > 0
+    else None
+)
+
+
+@dataclass(slots=True, frozen=True)
 class TranscriptWord:
     """Represents a single transcribed word with timing information."""
     text: str
@@ -36,7 +103,7 @@ class TranscriptWord:
     speaker_id: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TranscriptChunk:
     """Represents a time-windowed chunk of transcript aligned with recording timeline."""
     start_time: float
@@ -45,7 +112,7 @@ class TranscriptChunk:
     words: List[TranscriptWord]
 
 
-@dataclass
+@dataclass(slots=True)
 class TranscriptionResult:
     """Complete transcription result with word-level and chunked data."""
     full_text: str
@@ -76,24 +143,56 @@ class TranscriptionService:
         self.chunk_window = chunk_window or DEFAULT_CHUNK_WINDOW
         self.enabled = ENABLE_TRANSCRIPTION and bool(self.api_key)
         self.client = None
+        # True when self.client is AsyncElevenLabs and convert() is awaitable.
+        self.client_is_async = False
+
+        # The SDK import costs hundreds of ms, so the client is built on first
+        # use (see _ensure_client) rather than with the service.
+        self._client_lock = threading.Lock()
 
         if not self.enabled:
             if not self.api_key:
                 logger.info("Transcription service disabled: missing ELEVENLABS_API_KEY")
             else:
                 logger.info("Transcription service disabled: ENABLE_TRANSCRIPTION != 1")
-        else:
-            # Initialize ElevenLabs client
+
+    def _ensure_client(self) -> bool:
+        """
+        Import the ElevenLabs SDK and construct the client if not done yet.
+
+        Blocking (module import); async callers run it in a worker thread.
+        Disables the service if the SDK is missing or the client fails to build.
+
+        Returns:
+            True if a client is available
+        """
+        if self.client is not None:
+            return True
+        with self._client_lock:
+            if self.client is not None or not self.enabled:
+                return self.client is not None
+            # Prefer the native asyncio client so uploads run on the event
+            # loop without a thread hop.
             try:
-                from elevenlabs.client import ElevenLabs
-                self.client = ElevenLabs(api_key=self.api_key)
-                logger.info("ElevenLabs client initialized successfully")
+                try:
+                    from elevenlabs.client import AsyncElevenLabs
+                except ImportError:  # older SDKs ship only the sync client
+                    from elevenlabs.client import ElevenLabs
+                    self.client = ElevenLabs(api_key=self.api_key)
+                else:
+                    self.client = AsyncElevenLabs(api_key=self.api_key)
+                    self.client_is_async = True
+                logger.info(
+                    "ElevenLabs client initialized successfully (async=%s)",
+                    self.client_is_async,
+                )
             except ImportError:
                 logger.error("elevenlabs package not installed. Run: pip install elevenlabs")
                 self.enabled = False
             except Exception as exc:
                 logger.error("Failed to initialize ElevenLabs client: %s", exc)
                 self.enabled = False
+        return self.client is not None
 
     async def transcribe(
         self,
@@ -131,9 +230,53 @@ class TranscriptionService:
             return None
 
         try:
-            # Decode base64 audio to bytes
-            audio_bytes = base64.b64decode(audio_wav_base64)
+            # Decode base64 audio to bytes. Strict validation rejects a corrupt
+            # payload here instead of after a full upload round-trip.
+            audio_bytes = _b64decode(audio_wav_base64, validate=True)
+        except ValueError as exc:
+            # binascii.Error is a ValueError subclass; a str with non-ASCII
+            # characters raises plain ValueError before any base64 decoding.
+            logger.warning("Transcription skipped: audio is not valid base64 (%s)", exc)
+            return None
+
+        return await self.transcribe_bytes(audio_bytes, language=language)
+
+    async def transcribe_bytes(
+        self,
+        audio_bytes: bytes,
+        *,
+        language: Optional[str] = None,
+    ) -> Optional[TranscriptionResult]:
+        """
+        Transcribe raw WAV bytes using ElevenLabs STT API.
+
+        Same contract as transcribe(), for callers that already hold the decoded
+        audio and can skip the base64 round-trip.
 
+        Args:
+            audio_bytes: Raw WAV audio data
+            language: Language code (e.g., 'en', 'es'). Defaults to TRANSCRIPTION_LANGUAGE env var.
+
+        Returns:
+            TranscriptionResult, or None if transcription fails or is disabled.
+        """
+        if not self.enabled:
+            logger.debug("Transcription skipped: service disabled")
+            return None
+
+        if not audio_bytes:
+            logger.warning("Transcription skipped: empty audio data")
+            return None
+
+        if len(audio_bytes) < TRANSCRIPTION_MIN_BYTES:
+            logger.info(
+                "Transcription skipped: audio too short (%d bytes < %d)",
+                len(audio_bytes),
+                TRANSCRIPTION_MIN_BYTES,
+            )
+            return None
+
+        try:
             # Create BytesIO object for SDK
             audio_file = BytesIO(audio_bytes)
             audio_file.name = "recording.wav"  # SDK needs a filename
@@ -153,7 +296,10 @@ class TranscriptionService:
                 len(result.chunks),
                 result.language_code
             )
-            logger.info("Full transcript text: %s", result.full_text)
+            # The full transcript can run to tens of KB; keep it out of INFO
+            # logs and skip the call entirely unless DEBUG is on.
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Full transcript text: %s", result.full_text)
 
             return result
 
@@ -181,18 +327,46 @@ class TranscriptionService:
         Raises:
             Exception: If API request fails
         """
+        if self.client is None:
+            # First call: keep the SDK import off the event loop.
+            await asyncio.to_thread(self._ensure_client)
         if not self.client:
             raise RuntimeError("ElevenLabs client not initialized")
 
-        # Call SDK in thread to avoid blocking async loop
-        response = await asyncio.to_thread(
-            self.client.speech_to_text.convert,
-            file=audio_file,
-            model_id="scribe_v1",  # Only model available currently
-            tag_audio_events=True,  # Tag events like laughter, applause
-            language_code=language,  # Language of the audio
-            diarize=True,  # Annotate who is speaking
-        )
+        convert = self.client.speech_to_text.convert
+        convert_kwargs: Dict[str, Any] = {
+            "file": audio_file,
+            "model_id": "scribe_v1",  # Only model available currently
+            "tag_audio_events": True,  # Tag events like laughter, applause
+            "language_code": language,  # Language of the audio
+            "diarize": True,  # Annotate who is speaking
+        }
+        for attempt in range(TRANSCRIPTION_MAX_RETRIES + 1):
+            if _STT_RATE_LIMITER is not None:
+                await _STT_RATE_LIMITER.acquire()
+            audio_file.seek(0)  # a retried upload must resend from the start
+            try:
+                if self.client_is_async:
+                    response = await convert(**convert_kwargs)
+                else:
+                    # Sync SDK: call on the bounded STT pool to avoid blocking async loop
+                    response = await asyncio.get_running_loop().run_in_executor(
+                        _STT_EXECUTOR, functools.partial(convert, **convert_kwargs)
+                    )
+                break
+            except Exception as exc:
+                # The SDK raises ApiError(status_code=429) when rate limited.
+                rate_limited = getattr(exc, "status_code", None) == 429
+                if not rate_limited or attempt >= TRANSCRIPTION_MAX_RETRIES:
+                    raise
+                delay = TRANSCRIPTION_RETRY_BASE_DELAY * (2 ** attempt)
+                logger.warning(
+                    "ElevenLabs rate limited (429); retrying in %.1fs (attempt %d/%d)",
+                    delay,
+                    attempt + 1,
+                    TRANSCRIPTION_MAX_RETRIES,
+                )
+                await asyncio.sleep(delay)
 
         # Convert response to dict format that our parser expects
         # The SDK returns a SpeechToTextResponse object
@@ -223,17 +397,19 @@ class TranscriptionService:
         language_code = response_data.get("language_code", "unknown")
         raw_words = response_data.get("words", [])
 
-        # Extract only actual words (filter out spacing and audio events)
-        words: List[TranscriptWord] = []
-        for item in raw_words:
-            item_type = item.get("type", "word")
-            if item_type == "word":
-                words.append(TranscriptWord(
-                    text=item.get("text", ""),
-                    start=float(item.get("start", 0.0)),
-                    end=float(item.get("end", 0.0)),
-                    speaker_id=item.get("speaker_id"),
-                ))
+        # Extract only actual words (filter out spacing and audio events).
+        # Timestamps come from the SDK's pydantic model already typed as
+        # Optional[float], so only a missing value needs defaulting.
+        words: List[TranscriptWord] = [
+            TranscriptWord(
+                text=item.get("text", ""),
+                start=item.get("start") or 0.0,
+                end=item.get("end") or 0.0,
+                speaker_id=item.get("speaker_id"),
+            )
+            for item in raw_words
+            if item.get("type", "word") == "word"
+        ]
 
         # Group words into time-windowed chunks for better context
         chunks = self._create_chunks(words)
@@ -271,20 +447,25 @@ class TranscriptionService:
 
         chunks: List[TranscriptChunk] = []
         current_chunk_words: List[TranscriptWord] = []
+        window = self.chunk_window
         chunk_start = 0.0
+        # Boundary of the open window, kept alongside chunk_start so the
+        # per-word test is a single comparison.
+        chunk_end = window
 
         for word in words:
             word_start = word.start
 
             # Check if word belongs in current chunk window
-            if word_start >= chunk_start + self.chunk_window:
+            if word_start >= chunk_end:
                 # Finalize current chunk if it has words
                 if current_chunk_words:
                     chunks.append(self._finalize_chunk(chunk_start, current_chunk_words))
 
                 # Start new chunk
                 # Align chunk_start to window boundaries (0, 5, 10, 15, ...)
-                chunk_start = (word_start // self.chunk_window) * self.chunk_window
+                chunk_start = (word_start // window) * window
+                chunk_end = chunk_start + window
                 current_chunk_words = [word]
             else:
                 current_chunk_words.append(word)
@@ -318,8 +499,9 @@ class TranscriptionService:
                 words=[]
             )
 
-        # Concatenate word texts with spaces
-        text = " ".join(word.text for word in words).strip()
+        # Concatenate word texts with spaces (a list, not a generator: join
+        # materializes its argument anyway, so this skips the generator frames)
+        text = " ".join([word.text for word in words]).strip()
 
         # Use actual word boundaries for chunk timing (more accurate than window)
         actual_start = words[0].start
@@ -366,6 +548,7 @@ class TranscriptionService:
 
 # Module-level singleton instance
 _transcription_service: Optional[TranscriptionService] = None
+_transcription_service_lock = threading.Lock()
 
 
 def get_transcription_service() -> TranscriptionService:
@@ -377,5 +560,9 @@ def get_transcription_service() -> TranscriptionService:
     """
     global _transcription_service
     if _transcription_service is None:
-        _transcription_service = TranscriptionService()
+        # Double-checked so concurrent first callers (event loop plus worker
+        # threads) build exactly one service and one SDK client.
+        with _transcription_service_lock:
+            if _transcription_service is None:
+                _transcription_service = TranscriptionService()
     return _transcription_service
@@ -6,6 +6,7 @@ Each Gemini instance thinks it's talking to a human, but we route the text betwe
 
 Setup:
     pip install google-genai websockets
+    pip install uvloop  # optional, faster event loop (Linux/macOS)
 
 Usage:
     export GEMINI_API_KEY="your-api-key"
@@ -17,10 +18,10 @@ The debate will start automatically and stream text to any connected browser cli
 import os
 import asyncio
 import json
-import base64
-import traceback
+import time
 import logging
-from typing import Optional
+from collections import OrderedDict
+from typing import Callable, Optional
 from datetime import datetime
 from enum import Enum
 
@@ -28,6 +29,11 @@ import websockets
 from google import genai
 from google.genai import types
 
+try:  # Optional: libuv-based event loop, faster socket I/O for client fan-out
+    import uvloop
+except ImportError:  # not installed (or unsupported platform, e.g. Windows)
+    uvloop = None
+
 # Import TTS module for audio generation
 from tts import ElevenLabsTTS
 
@@ -47,10 +53,20 @@ logger = logging.getLogger(__name__)
 
 # Model for non-Live streaming generation
 MODEL = "gemini-flash-lite-latest"
+# Exchanges (user + model Content pairs) of history sent with each turn
+MAX_HISTORY_PAIRS = 6
 
 # WebSocket server configuration
 WS_HOST = "localhost"
 WS_PORT = 8765
+# Target size of the binary frames TTS audio chunks are coalesced into
+AUDIO_FRAME_BYTES = 64 * 1024
+# A client with more unsent data than this queued is dropped as too slow
+MAX_CLIENT_BACKLOG_BYTES = 4 * 1024 * 1024
+# Longest we wait for a client's playback_complete before publishing the next turn
+PLAYBACK_TIMEOUT = 30.0
+# Max number of generated background images kept in memory (keyed by topic)
+BACKGROUND_CACHE_SIZE = 32
 obama_voice = "77R1BwNT6WJF5Bjget1w"
 trump_voice = "AyNb8ExdIoh13YThHcFH"
 
@@ -71,7 +87,18 @@ client = genai.Client(
 tts_client = ElevenLabsTTS()
 
 
-async def generate_debate_background(topic: str) -> Optional[bytes]:
+# LRU cache of generated backgrounds: normalized topic -> (image_bytes, mime_type)
+_background_cache: "OrderedDict[str, tuple[bytes, str]]" = OrderedDict()
+
+
+def _background_cache_key(topic: str) -> str:
+    """Normalize a topic so trivially different spellings share a cache entry."""
+    return " ".join(topic.lower().split())
+
+
+async def generate_debate_background(
+    topic: str, is_active: Optional[Callable[[], bool]] = None
+) -> tuple[Optional[bytes], Optional[str]]:
     """
     Generate a South Park-style background image for the given debate topic.
 
@@ -82,19 +109,36 @@ async def generate_debate_background(topic: str) -> Optional[bytes]:
     Architecture note:
     - Runs in background parallel to debate loop
     - Returns PNG/JPEG binary data directly (no file I/O)
-    - Graceful failure: returns None if generation fails
+    - Graceful failure: returns (None, None) if generation fails
 
     Args:
         topic: The debate topic to visualize (e.g., "climate change")
+        is_active: Checked right before calling Gemini; if it returns False
+            (e.g. nobody is connected anymore) generation is skipped
 
     Returns:
-        Binary image data (PNG or JPEG) on success, None on failure
+        (image_bytes, mime_type) tuple with the PNG/JPEG data on success,
+        (None, None) on failure or when skipped
 
     Trade-offs:
-    - Fresh generation per debate (no caching) - costs API credits but ensures uniqueness
+    - Successful images are cached per topic (case/whitespace-insensitive, LRU of
+      BACKGROUND_CACHE_SIZE) - a repeated topic reuses its image instead of paying
+      another 5-15s generation, at the cost of not getting a fresh one
     - Simple prompt passthrough - lets Gemini interpret the topic creatively
-    - Synchronous API call wrapped in async - uses thread pool to avoid blocking
+    - Uses the SDK's async client (client.aio) - no thread pool, shares the
+      client's connection pool with the debate turns
     """
+    cache_key = _background_cache_key(topic)
+    cached = _background_cache.get(cache_key)
+    if cached is not None:
+        _background_cache.move_to_end(cache_key)
+        logger.info(f"🎨 Using cached background image for topic: {topic}")
+        return cached
+
+    if is_active is not None and not is_active():
+        logger.info("🎨 Skipping background image generation - no longer needed")
+        return None, None
+
     logger.info(f"🎨 Starting background image generation for topic: {topic}")
 
     try:
@@ -117,17 +161,15 @@ async def generate_debate_background(topic: str) -> Optional[bytes]:
             ],
         )
 
-        # Run synchronous Gemini API call in thread pool to avoid blocking event loop
-        # This is crucial for maintaining responsiveness of the debate server
-        def _generate_image():
+        async def _generate_image():
             """
-            Synchronous wrapper for Gemini API call.
+            Stream the Gemini response using the async client.
 
             Iterates through streaming chunks to find the image data.
             The API may return multiple chunks, but we only need the first one
             that contains inline image data.
             """
-            for chunk in client.models.generate_content_stream(
+            async for chunk in await client.aio.models.generate_content_stream(
                 model="gemini-2.5-flash-image",
                 contents=contents,
                 config=generate_content_config,
@@ -157,11 +199,14 @@ async def generate_debate_background(topic: str) -> Optional[bytes]:
             logger.warning("No image data found in Gemini response chunks")
             return None, None
 
-        # Execute in thread pool to avoid blocking asyncio event loop
-        image_bytes, mime_type = await asyncio.to_thread(_generate_image)
+        # Runs on the event loop via the async client (no thread pool needed)
+        image_bytes, mime_type = await _generate_image()
 
         if image_bytes:
             logger.info(f"🎨 Background image generation complete ({len(image_bytes)} bytes)")
+            _background_cache[cache_key] = (image_bytes, mime_type)
+            if len(_background_cache) > BACKGROUND_CACHE_SIZE:
+                _background_cache.popitem(last=False)
             return image_bytes, mime_type
         else:
             logger.warning("Background image generation returned no data")
@@ -190,10 +235,16 @@ class DebateState(Enum):
 
 class AudioBuffer:
     """
-    Thread-safe buffer for storing audio chunks in memory.
+    In-memory stream of audio chunks for one speaker's turn.
 
     This class manages the audio data for one speaker's turn, allowing
-    concurrent generation (TTS streaming) and consumption (WebSocket sending).
+    concurrent generation (TTS streaming) and consumption (WebSocket sending):
+    chunks are handed to the consumer through an asyncio.Queue as soon as
+    ElevenLabs yields them, so clients receive audio while TTS is still running.
+
+    No lock is needed: producer and consumer both run on the single asyncio
+    event loop and no producer method awaits, so each call is atomic with
+    respect to other coroutines.
 
     Benefits of in-memory buffering:
     - Lower latency than disk I/O
@@ -203,36 +254,49 @@ class AudioBuffer:
 
     def __init__(self, speaker: str):
         self.speaker = speaker
-        self.chunks: list[bytes] = []
+        # Unbounded on purpose: a turn is one sentence (tens of KB of MP3), and
+        # a bound would stall TTS if the consumer stops early on disconnect.
+        # None is the end-of-stream sentinel.
+        self._queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue()
+        self.chunk_count = 0
+        self.total_bytes = 0  # running sum of len(chunk), kept by add_chunk
         self.complete = False
-        self.lock = asyncio.Lock()
         logger.debug(f"Created AudioBuffer for {speaker}")
 
-    async def add_chunk(self, chunk: bytes):
-        """Add an audio chunk to the buffer (called by TTS generator)."""
-        async with self.lock:
-            self.chunks.append(chunk)
-            logger.debug(f"AudioBuffer({self.speaker}): Added chunk ({len(chunk)} bytes), total chunks: {len(self.chunks)}")
+    def add_chunk(self, chunk: bytes):
+        """Add an audio chunk to the stream (called by TTS generator)."""
+        self._queue.put_nowait(chunk)
+        self.chunk_count += 1
+        self.total_bytes += len(chunk)
+        # %-style args: per-chunk hot path, formatted only if DEBUG is enabled
+        logger.debug(
+            "AudioBuffer(%s): Added chunk (%d bytes), total chunks: %d",
+            self.speaker, len(chunk), self.chunk_count,
+        )
 
-    async def mark_complete(self):
-        """Mark this buffer as complete (no more chunks coming)."""
-        async with self.lock:
-            self.complete = True
-            logger.debug(f"AudioBuffer({self.speaker}): Marked complete with {len(self.chunks)} total chunks")
+    def mark_complete(self):
+        """Mark this buffer as complete (no more chunks coming). Idempotent."""
+        if self.complete:
+            return
+        self.complete = True
+        self._queue.put_nowait(None)
+        logger.debug(
+            "AudioBuffer(%s): Marked complete with %d total chunks",
+            self.speaker, self.chunk_count,
+        )
 
-    async def get_all_chunks(self) -> list[bytes]:
-        """Get all buffered audio chunks (called when ready to stream to client)."""
-        async with self.lock:
-            return list(self.chunks)  # Return a copy to avoid concurrent modification
+    async def iter_chunks(self):
+        """Yield chunks as they arrive until mark_complete() (single consumer)."""
+        while (chunk := await self._queue.get()) is not None:
+            yield chunk
 
-    async def is_complete(self) -> bool:
+    def is_complete(self) -> bool:
         """Check if audio generation is complete."""
-        async with self.lock:
-            return self.complete
+        return self.complete
 
     def get_total_size(self) -> int:
-        """Get total size of buffered audio in bytes."""
-        return sum(len(chunk) for chunk in self.chunks)
+        """Get total size of buffered audio in bytes (O(1), maintained by add_chunk)."""
+        return self.total_bytes
 
 
 def _build_user_content(text: str) -> types.Content:
@@ -258,9 +322,6 @@ class DebateParticipant:
 
         logger.info(f"Initializing debate participant: {name} with voice {voice_id}")
 
-        # For broadcasting to web clients
-        self.broadcast_queue = asyncio.Queue()
-
         # Opponent reference set by DebateServer
         self.opponent: Optional["DebateParticipant"] = None
 
@@ -269,6 +330,7 @@ class DebateParticipant:
         self.last_spoke_time = 0.0
 
         # Conversation history from this participant's perspective
+        # (last MAX_HISTORY_PAIRS exchanges)
         self.history: list[types.Content] = []
 
         # Audio buffer for the current turn (cleared after each turn)
@@ -277,54 +339,60 @@ class DebateParticipant:
         # State tracking for turn-based orchestration
         self.state = DebateState.IDLE
 
-    def get_config(self) -> types.GenerateContentConfig:
-        """Create GenerateContentConfig for text-only debate."""
-        return types.GenerateContentConfig(
+        # GenerateContentConfig for text-only debate; the persona never
+        # changes, so it is built once and reused for every turn
+        self.config = types.GenerateContentConfig(
             system_instruction=self.system_instruction,
             thinking_config=types.ThinkingConfig(thinking_budget=0),
         )
 
     async def generate_once(self, user_text: str) -> str:
         """Generate a single response using streaming API, returning concatenated text."""
-        contents = self.history + [_build_user_content(user_text)]
+        user_content = _build_user_content(user_text)
+        contents = [*self.history, user_content]
 
-        def _run() -> str:
+        self.is_speaking = True
+        try:
+            # Native async client: chunks are read on the event loop, no thread hop
             acc = []
-            for chunk in client.models.generate_content_stream(
-                model=MODEL, contents=contents, config=self.get_config()
+            async for chunk in await client.aio.models.generate_content_stream(
+                model=MODEL, contents=contents, config=self.config
             ):
                 if getattr(chunk, "text", None):
                     acc.append(chunk.text)
-            return "".join(acc)
-
-        self.is_speaking = True
-        try:
-            text = await asyncio.to_thread(_run)
-            self.history.append(
-                types.Content(role="user", parts=[types.Part(text=user_text)])
-            )
+            text = "".join(acc)
+            self.history.append(user_content)
             self.history.append(
                 types.Content(role="model", parts=[types.Part(text=text)])
             )
-            self.last_spoke_time = asyncio.get_event_loop().time()
+            # Sliding window: the topic and persona live in the system
+            # instruction, so only the recent exchanges are worth resending
+            if len(self.history) > 2 * MAX_HISTORY_PAIRS:
+                del self.history[: -2 * MAX_HISTORY_PAIRS]
+            self.last_spoke_time = time.monotonic()
             return text
         finally:
             self.is_speaking = False
 
-    async def generate_audio(self, text: str) -> AudioBuffer:
+    async def generate_audio(
+        self, text: str, buffer: Optional[AudioBuffer] = None
+    ) -> AudioBuffer:
         """
         Generate audio for the given text using ElevenLabs TTS.
 
-        This method streams audio chunks from ElevenLabs and buffers them in memory.
-        The audio buffer is stored in self.audio_buffer for later streaming to the client.
+        This method streams audio chunks from ElevenLabs into an AudioBuffer as
+        they arrive. Pass a buffer that has already been handed to the broadcast
+        task to have clients receive the audio while it is still being generated.
+        The buffer is also stored in self.audio_buffer.
 
         This runs concurrently with the opponent's audio playback to minimize latency.
 
         Args:
             text: The text to convert to speech
+            buffer: Buffer to stream into; a fresh one is created if omitted
 
         Returns:
-            AudioBuffer containing all MP3 audio chunks
+            AudioBuffer that received all MP3 audio chunks
 
         Raises:
             RuntimeError: If TTS fails after max retries
@@ -332,35 +400,39 @@ class DebateParticipant:
         logger.info(f"{self.name}: Starting audio generation for text: {text[:50]}...")
 
         # Create fresh audio buffer for this turn
-        self.audio_buffer = AudioBuffer(self.name)
+        if buffer is None:
+            buffer = AudioBuffer(self.name)
+        self.audio_buffer = buffer
         self.state = DebateState.GENERATING_AUDIO
 
         try:
-            # Stream audio chunks from ElevenLabs and buffer them
+            # Stream audio chunks from ElevenLabs into the buffer
             async for chunk in tts_client.stream_text_to_speech_yield(
                 voice_id=self.voice_id,
                 text=text
             ):
-                await self.audio_buffer.add_chunk(chunk)
-                logger.debug(f"{self.name}: Buffered audio chunk ({len(chunk)} bytes)")
-
-            # Mark buffer as complete
-            await self.audio_buffer.mark_complete()
+                buffer.add_chunk(chunk)
+                logger.debug("%s: Buffered audio chunk (%d bytes)", self.name, len(chunk))
 
-            total_size = self.audio_buffer.get_total_size()
+            total_size = buffer.get_total_size()
             logger.info(
                 f"{self.name}: Audio generation complete. "
-                f"Total: {total_size} bytes ({len(self.audio_buffer.chunks)} chunks)"
+                f"Total: {total_size} bytes ({buffer.chunk_count} chunks)"
             )
 
             self.state = DebateState.WAITING_FOR_CLIENT
-            return self.audio_buffer
+            return buffer
 
         except Exception as e:
             logger.error(f"{self.name}: Audio generation failed: {e}", exc_info=True)
             self.state = DebateState.IDLE
             raise
 
+        finally:
+            # Always end the stream (also on failure/cancellation) so a consumer
+            # already streaming this buffer is never left waiting
+            buffer.mark_complete()
+
 
 class DebateServer:
     """
@@ -389,8 +461,21 @@ class DebateServer:
         # Event to signal when topic is received and debate should start
         self.topic_received = asyncio.Event()
 
+        # Messages for web clients from both participants, in the order they
+        # were produced (recreated for each debate)
+        self.broadcast_queue: asyncio.Queue[dict] = asyncio.Queue()
+
+        # Pacing: set when a client reports it finished playing the audio of
+        # playing_speaker (the last published turn)
+        self.playback_done = asyncio.Event()
+        self.playing_speaker: Optional[str] = None
+
+        # (background_image_start header, image bytes) for the current debate,
+        # kept so clients connecting mid-debate get the image too
+        self.background_frames: Optional[tuple[str, bytes]] = None
+
         # Track last speaking times to detect silence
-        self.last_speaking_time = asyncio.get_event_loop().time()
+        self.last_speaking_time = time.monotonic()
         self.silence_threshold = 3.0  # seconds of silence before nudging
 
     def initialize_participants(self, debate_topic: str):
@@ -405,6 +490,9 @@ class DebateServer:
         logger.info(f"Initializing participants for debate topic: {debate_topic}")
         self.debate_topic = debate_topic
 
+        # Fresh queue so nothing left over from a previous debate is replayed
+        self.broadcast_queue = asyncio.Queue()
+
         # Create two participants with different personas and voices
         self.obama = DebateParticipant(
             name="Obama",
@@ -487,6 +575,41 @@ FIGHTING SPIRIT - NEVER BACK DOWN:
 
     # Live routing removed in non-Live configuration
 
+    def send_to_clients(self, message):
+        """
+        Send one text (JSON) or binary frame to every connected web client.
+
+        Uses websockets.broadcast(): the frame is encoded once and written to
+        each open connection synchronously, without a task or coroutine per
+        client. Closed connections are skipped, so a client that disconnects
+        mid-send can't break the fan-out (same effect as the previous
+        gather(..., return_exceptions=True)).
+
+        broadcast() never waits on a slow client, but it also has no
+        backpressure: data a client can't keep up with piles up in that
+        connection's write buffer. A client whose backlog exceeds
+        MAX_CLIENT_BACKLOG_BYTES is aborted instead, which bounds memory per
+        client; websocket_handler then removes it as for any disconnect.
+
+        Args:
+            message: str for a text frame, bytes for a binary frame
+        """
+        if not self.web_clients:
+            return
+
+        recipients = []
+        for ws in self.web_clients:
+            backlog = ws.transport.get_write_buffer_size()
+            if backlog > MAX_CLIENT_BACKLOG_BYTES:
+                logger.warning(
+                    f"Dropping slow client {id(ws)} ({backlog} bytes not yet sent)"
+                )
+                ws.transport.abort()
+            else:
+                recipients.append(ws)
+
+        websockets.broadcast(recipients, message)
+
     async def broadcast_to_clients(self):
         """
         Sends text and state updates to all connected web clients.
@@ -503,59 +626,31 @@ FIGHTING SPIRIT - NEVER BACK DOWN:
                     logger.info("⏹️  No clients connected - exiting broadcast task")
                     break
 
-                # Get messages from both participants and broadcast
+                # Get the next message from either participant and broadcast it
                 # Use wait_for with timeout to periodically check for disconnections
-                tasks = [
-                    asyncio.create_task(self.obama.broadcast_queue.get()),
-                    asyncio.create_task(self.trump.broadcast_queue.get()),
-                ]
-
                 try:
-                    # Wait for messages with a timeout to allow periodic client checks
-                    done, pending = await asyncio.wait(
-                        tasks, return_when=asyncio.FIRST_COMPLETED, timeout=1.0
+                    message = await asyncio.wait_for(
+                        self.broadcast_queue.get(), timeout=1.0
                     )
+                except TimeoutError:
+                    continue
 
-                    # If timeout occurred (no messages received), cancel tasks and loop again
-                    if not done:
-                        for task in pending:
-                            task.cancel()
-                        continue
-
-                    # Cancel pending tasks
-                    for task in pending:
-                        task.cancel()
-
-                    # Get the message that completed first
-                    for task in done:
-                        message = task.result()
-
-                        logger.debug(
-                            f"Broadcasting message to {len(self.web_clients)} clients: {message.get('type', 'unknown')}"
-                        )
-
-                        # Handle different message types
-                        if message.get('type') == 'audio_ready':
-                            # Stream audio chunks to clients as binary frames
-                            await self.stream_audio_to_clients(message)
-                        else:
-                            # Send text messages as JSON
-                            message_json = json.dumps(message)
-                            if self.web_clients:
-                                await asyncio.gather(
-                                    *[client.send(message_json) for client in self.web_clients],
-                                    return_exceptions=True,
-                                )
-                            else:
-                                logger.info("⏹️  Clients disconnected during broadcast")
-                                break
+                logger.debug(
+                    f"Broadcasting message to {len(self.web_clients)} clients: {message.get('type', 'unknown')}"
+                )
 
-                except asyncio.CancelledError:
-                    # Clean up pending tasks on cancellation
-                    for task in tasks:
-                        if not task.done():
-                            task.cancel()
-                    raise
+                # Handle different message types
+                if message.get('type') == 'audio_ready':
+                    # Stream audio chunks to clients as binary frames
+                    await self.stream_audio_to_clients(message)
+                else:
+                    # Send text messages as JSON
+                    message_json = json.dumps(message)
+                    if self.web_clients:
+                        self.send_to_clients(message_json)
+                    else:
+                        logger.info("⏹️  Clients disconnected during broadcast")
+                        break
 
         except asyncio.CancelledError:
             logger.info("⏹️  Broadcast task cancelled")
@@ -583,13 +678,23 @@ FIGHTING SPIRIT - NEVER BACK DOWN:
         Trade-offs:
         - Image may appear mid-debate (user accepts this per requirements)
         - No retry logic (single attempt keeps complexity low)
-        - Base64 encoding increases message size ~33% but simplifies JSON transport
+        - Image goes out as a small JSON header plus one raw binary frame (no base64:
+          ~33% fewer bytes and no encode/decode). Both are written back-to-back with
+          no await in between, so they can't be split by an audio frame; the client
+          treats the binary frame right after background_image_start as the image.
         """
         logger.info(f"🎨 Background generation task started for: {topic}")
 
+        # Don't pay for an image nobody will see
+        if not self.web_clients:
+            logger.info("No clients connected - skipping background image generation")
+            return
+
         try:
             # Generate the image (this is the slow part - 5-15 seconds typically)
-            result = await generate_debate_background(topic)
+            result = await generate_debate_background(
+                topic, is_active=lambda: bool(self.web_clients)
+            )
 
             # Check if generation succeeded
             if result is None or result[0] is None:
@@ -603,30 +708,26 @@ FIGHTING SPIRIT - NEVER BACK DOWN:
                 logger.info("No clients connected - skipping background image broadcast")
                 return
 
-            # Encode image as base64 for JSON transport
-            # This is simpler than sending as binary WebSocket frame with metadata
-            image_base64 = base64.b64encode(image_bytes).decode('utf-8')
-
             # Extract image format from MIME type (e.g., "image/png" -> "png")
             image_format = mime_type.split('/')[-1] if mime_type else 'png'
 
-            # Send to all connected clients
-            message = json.dumps({
-                'type': 'background_image',
-                'data': image_base64,
+            # Header announcing the binary frame that follows; kept together with
+            # the image bytes for clients that connect later
+            header = json.dumps({
+                'type': 'background_image_start',
                 'format': image_format,
+                'size': len(image_bytes),
                 'topic': topic  # Include topic for debugging/logging
             })
+            self.background_frames = (header, image_bytes)
 
             logger.info(
                 f"📤 Sending background image to {len(self.web_clients)} clients "
-                f"({len(image_base64)} chars base64, format: {image_format})"
+                f"({len(image_bytes)} bytes binary, format: {image_format})"
             )
 
-            await asyncio.gather(
-                *[client.send(message) for client in self.web_clients],
-                return_exceptions=True,
-            )
+            self.send_to_clients(header)
+            self.send_to_clients(image_bytes)
 
             logger.info("✅ Background image sent to all clients")
 
@@ -638,24 +739,27 @@ FIGHTING SPIRIT - NEVER BACK DOWN:
         """
         Stream audio chunks to all connected clients via binary WebSocket frames.
 
+        Frames go out uncompressed (server runs with compression=None): the
+        chunks are MP3, which is already compressed.
+
         This method:
-        1. Retrieves the audio buffer for the specified speaker
+        1. Takes the audio buffer carried by the audio_ready message
         2. Sends a JSON message indicating audio is incoming
-        3. Streams each audio chunk as a binary WebSocket frame
+        3. Streams audio as binary WebSocket frames while TTS is still producing it
         4. Sends a JSON message indicating audio streaming is complete
 
         Args:
-            message: Dictionary with 'speaker' key indicating which participant's audio to stream
+            message: audio_ready dict with 'speaker' and the 'buffer' to stream
         """
         speaker_name = message.get('speaker')
         if not speaker_name:
             logger.error("stream_audio_to_clients called without speaker name")
             return
 
-        # Get the participant
-        participant = self.obama if speaker_name == "Obama" else self.trump
-
-        if not participant.audio_buffer or not await participant.audio_buffer.is_complete():
+        # The buffer travels with the message, so a participant starting its
+        # next turn (replacing participant.audio_buffer) can't swap it out
+        buffer: Optional[AudioBuffer] = message.get('buffer')
+        if buffer is None:
             logger.error(f"Audio buffer not ready for {speaker_name}")
             return
 
@@ -668,28 +772,40 @@ FIGHTING SPIRIT - NEVER BACK DOWN:
                 "speaker": speaker_name
             })
 
-            if self.web_clients:
-                await asyncio.gather(
-                    *[client.send(metadata) for client in self.web_clients],
-                    return_exceptions=True,
-                )
+            self.send_to_clients(metadata)
 
-            # Stream audio chunks as binary frames
-            chunks = await participant.audio_buffer.get_all_chunks()
+            # Stream audio as binary frames. TTS chunks are often only a few KB;
+            # the client just concatenates every frame between audio_start and
+            # audio_complete into one Blob, so coalesce them into ~64KB frames
+            # to cut per-frame overhead.
             total_bytes = 0
-
-            for i, chunk in enumerate(chunks):
+            frames_sent = 0
+            pending: list[bytes] = []
+            pending_bytes = 0
+            disconnected = False
+
+            def flush():
+                nonlocal total_bytes, frames_sent, pending, pending_bytes
+                # Send coalesced binary audio frame to all clients
+                self.send_to_clients(b"".join(pending))
+                total_bytes += pending_bytes
+                frames_sent += 1
+                logger.debug("Sent audio frame %d (%d bytes)", frames_sent, pending_bytes)
+                pending = []
+                pending_bytes = 0
+
+            async for chunk in buffer.iter_chunks():
                 if not self.web_clients:
                     logger.info("Clients disconnected during audio streaming")
+                    disconnected = True
                     break
+                pending.append(chunk)
+                pending_bytes += len(chunk)
+                if pending_bytes >= AUDIO_FRAME_BYTES:
+                    flush()
 
-                # Send binary audio chunk to all clients
-                await asyncio.gather(
-                    *[client.send(chunk) for client in self.web_clients],
-                    return_exceptions=True,
-                )
-                total_bytes += len(chunk)
-                logger.debug(f"Sent audio chunk {i+1}/{len(chunks)} ({len(chunk)} bytes)")
+            if pending and not disconnected:
+                flush()
 
             # Send completion message
             completion = json.dumps({
@@ -697,38 +813,91 @@ FIGHTING SPIRIT - NEVER BACK DOWN:
                 "speaker": speaker_name
             })
 
-            if self.web_clients:
-                await asyncio.gather(
-                    *[client.send(completion) for client in self.web_clients],
-                    return_exceptions=True,
-                )
+            self.send_to_clients(completion)
 
             logger.info(
                 f"✅ Finished streaming {speaker_name}'s audio: "
-                f"{total_bytes} bytes in {len(chunks)} chunks"
+                f"{total_bytes} bytes in {frames_sent} frames ({buffer.chunk_count} chunks)"
             )
 
-            # Clean up audio buffer after streaming
-            participant.audio_buffer = None
-
         except Exception as e:
             logger.error(f"Error streaming audio for {speaker_name}: {e}", exc_info=True)
 
+    def publish_turn(self, speaker: DebateParticipant, text: str, buffer: AudioBuffer):
+        """
+        Queue a speaker's turn for the broadcast task.
+
+        The transcript text and an audio_ready message carrying the turn's
+        AudioBuffer are queued together. TTS may still be producing into the
+        buffer; the broadcast task forwards whatever is already buffered and
+        then keeps streaming chunks as they arrive.
+
+        Also marks this turn as the one whose playback_complete we wait for.
+        """
+        self.playing_speaker = speaker.name
+        self.playback_done.clear()
+
+        # Broadcast text to client (for transcript display)
+        self.broadcast_queue.put_nowait(
+            {"type": "text", "speaker": speaker.name, "text": text}
+        )
+
+        # Signal that the speaker's audio is streaming
+        # The broadcast task will stream it to the client
+        self.broadcast_queue.put_nowait(
+            {"type": "audio_ready", "speaker": speaker.name, "buffer": buffer}
+        )
+
+    async def wait_for_playback(self):
+        """
+        Wait until a client reports it finished playing the last published turn.
+
+        Gives up after PLAYBACK_TIMEOUT seconds (e.g. the browser blocked
+        autoplay and will never report) or once all clients have disconnected,
+        so the debate can't stall on a missing playback_complete.
+        """
+        deadline = time.monotonic() + PLAYBACK_TIMEOUT
+        while not self.playback_done.is_set():
+            if not self.web_clients:
+                return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(
+                    f"No playback_complete for {self.playing_speaker} after "
+                    f"{PLAYBACK_TIMEOUT:.0f}s - continuing"
+                )
+                return
+            # Wake up periodically to notice disconnections
+            try:
+                await asyncio.wait_for(
+                    self.playback_done.wait(), timeout=min(1.0, remaining)
+                )
+            except TimeoutError:
+                pass
+
     async def debate_loop(self):
         """
         Orchestrate turn-based debate with audio pre-buffering.
 
         Architecture:
-        1. Generate current speaker's text + audio
-        2. Stream current speaker's audio to client
-        3. While client plays audio, generate next speaker's text + audio in background
-        4. Wait for client to signal playback complete
-        5. Repeat with roles reversed
-
-        This minimizes gaps between speakers by pre-generating the next response.
+        1. Generate current speaker's text, then its audio
+        2. Stream current speaker's audio to client while TTS produces it
+        3. While that TTS runs and the client plays it, generate next
+           speaker's text (it only needs the current text)
+        4. Once current speaker's TTS is done, start next speaker's TTS into
+           a buffer that isn't published yet
+        5. Wait for client to signal playback complete, then publish the next
+           turn (text + already-buffered audio)
+        6. Repeat with roles reversed
+
+        This minimizes gaps between speakers: the next turn's text and audio
+        are produced while the current one plays, so a turn costs roughly
+        max(text generation + TTS, playback) instead of their sum, and
+        speakers never talk over each other.
         """
         logger.info(f"Starting audio-enabled debate on topic: {self.debate_topic}")
 
+        audio_task: Optional[asyncio.Task] = None
         try:
             # === SPAWN BACKGROUND IMAGE GENERATION TASK ===
             # This runs in parallel with the debate and doesn't block conversation
@@ -748,19 +917,13 @@ FIGHTING SPIRIT - NEVER BACK DOWN:
             logger.info("Generating Obama's opening statement...")
             obama_text = await self.obama.generate_once(initial_prompt)
 
-            # Generate Obama's audio for opening
+            # Publish Obama's opening and stream its audio as it is generated
             logger.info("Generating Obama's opening audio...")
-            await self.obama.generate_audio(obama_text)
-
-            # Broadcast text to client (for transcript display)
-            self.obama.broadcast_queue.put_nowait(
-                {"type": "text", "speaker": self.obama.name, "text": obama_text}
-            )
-
-            # Signal that Obama's audio is ready to stream
-            self.obama.broadcast_queue.put_nowait(
-                {"type": "audio_ready", "speaker": self.obama.name}
+            buffer = AudioBuffer(self.obama.name)
+            audio_task = asyncio.create_task(
+                self.obama.generate_audio(obama_text, buffer)
             )
+            self.publish_turn(self.obama, obama_text, buffer)
 
             # === MAIN DEBATE LOOP ===
             # We alternate: Obama speaks → Trump speaks → Obama speaks → ...
@@ -781,42 +944,43 @@ FIGHTING SPIRIT - NEVER BACK DOWN:
                 logger.info(f"{'='*60}")
 
                 # === PARALLEL PIPELINE ===
-                # 1. Client is playing current_speaker's audio
-                # 2. We generate next_speaker's response + audio in background
-
-                # Start generating next speaker's response in background
+                # 1. current_speaker's audio is being generated (audio_task),
+                #    streamed to clients and played
+                # 2. next_speaker only needs current_text, so its response and
+                #    then its audio are generated meanwhile
                 logger.info(f"Generating {next_speaker.name}'s text response...")
-                next_text_task = asyncio.create_task(
-                    next_speaker.generate_once(current_text)
-                )
+                next_text = await next_speaker.generate_once(current_text)
 
-                # Wait for next speaker's text to be ready
-                next_text = await next_text_task
+                # One TTS stream at a time: wait for current_speaker's audio
+                buffer = await audio_task
+                logger.info(
+                    f"{current_speaker.name}'s audio ready "
+                    f"({buffer.get_total_size()} bytes of audio)"
+                )
 
                 # Check if client still connected
                 if not self.web_clients:
                     logger.info("⏹️  All clients disconnected - stopping debate loop")
                     break
 
-                # Generate next speaker's audio
+                # Generate next speaker's audio ahead of time (not published yet)
                 logger.info(f"Generating {next_speaker.name}'s audio...")
-                await next_speaker.generate_audio(next_text)
-
-                # Broadcast next speaker's text
-                next_speaker.broadcast_queue.put_nowait(
-                    {"type": "text", "speaker": next_speaker.name, "text": next_text}
+                next_buffer = AudioBuffer(next_speaker.name)
+                audio_task = asyncio.create_task(
+                    next_speaker.generate_audio(next_text, next_buffer)
                 )
 
-                # Signal that next speaker's audio is ready
-                # The broadcast task will stream it to the client
-                next_speaker.broadcast_queue.put_nowait(
-                    {"type": "audio_ready", "speaker": next_speaker.name}
-                )
+                # Join point: let the client finish current_speaker's audio
+                await self.wait_for_playback()
 
-                logger.info(
-                    f"{next_speaker.name}'s response ready "
-                    f"({next_speaker.audio_buffer.get_total_size()} bytes of audio)"
-                )
+                # Check if client still connected
+                if not self.web_clients:
+                    logger.info("⏹️  All clients disconnected - stopping debate loop")
+                    break
+
+                # Publish next speaker's text and audio; the broadcast task
+                # streams what is buffered, then the rest as TTS produces it
+                self.publish_turn(next_speaker, next_text, next_buffer)
 
                 # === SWAP ROLES FOR NEXT ITERATION ===
                 current_speaker, next_speaker = next_speaker, current_speaker
@@ -829,6 +993,10 @@ FIGHTING SPIRIT - NEVER BACK DOWN:
         except Exception as e:
             logger.error(f"❌ Error in debate_loop: {e}", exc_info=True)
             raise
+        finally:
+            # Don't leave a TTS stream running once the debate is over
+            if audio_task is not None and not audio_task.done():
+                audio_task.cancel()
 
     async def websocket_handler(self, websocket):
         """
@@ -857,6 +1025,14 @@ FIGHTING SPIRIT - NEVER BACK DOWN:
             )
             logger.debug(f"Sent connection acknowledgment to client {client_id}")
 
+            # Joining a debate in progress: send the already-generated background.
+            # broadcast() writes both frames without yielding, so an audio frame
+            # can't land between the header and the image
+            if self.background_frames is not None:
+                for frame in self.background_frames:
+                    websockets.broadcast((websocket,), frame)
+                logger.debug(f"Sent cached background image to client {client_id}")
+
             # Wait for client to send messages (debate topic or playback signals)
             async for message in websocket:
                 # Handle binary messages (not expected from client, but log if received)
@@ -915,10 +1091,10 @@ FIGHTING SPIRIT - NEVER BACK DOWN:
                     elif data.get("type") == "playback_complete":
                         speaker = data.get("speaker", "")
                         logger.info(f"Client {client_id} finished playing {speaker}'s audio")
-                        # Note: Currently we don't wait for playback_complete before
-                        # generating the next response. The generation happens immediately.
-                        # This message is here for future use if we want to pace the debate
-                        # based on client playback speed.
+                        # debate_loop publishes the next turn once the current one
+                        # has been played (first client to finish wins)
+                        if speaker == self.playing_speaker:
+                            self.playback_done.set()
 
                 except json.JSONDecodeError as e:
                     logger.error(
@@ -963,12 +1139,16 @@ FIGHTING SPIRIT - NEVER BACK DOWN:
             # Start WebSocket server for browser clients (persistent across multiple debates)
             # Increase max_size to 10MB to accommodate base64-encoded images (~2-3MB typical)
             # Default is 1MB which would reject our background images
+            # compression=None: nearly all traffic is MP3 audio, which is already
+            # compressed, so permessage-deflate would only burn CPU per frame and
+            # hold zlib state per connection
             logger.info(f"Starting WebSocket server on {WS_HOST}:{WS_PORT}")
             ws_server = await websockets.serve(
                 self.websocket_handler,
                 WS_HOST,
                 WS_PORT,
                 max_size=10 * 1024 * 1024,  # 10MB max message size
+                compression=None,
             )
             logger.info(f"🌐 WebSocket server started on ws://{WS_HOST}:{WS_PORT} (max message size: 10MB)")
             logger.info("⏳ Waiting for client to connect and send debate topic...\n")
@@ -998,6 +1178,8 @@ FIGHTING SPIRIT - NEVER BACK DOWN:
                 logger.info("🧹 Cleaning up debate state for next session...")
                 self.topic_received.clear()  # Allow new topics
                 self.debate_topic = None
+                self.background_frames = None
+                self.playing_speaker = None
                 self.obama = None
                 self.trump = None
                 logger.info("✅ Ready for next debate topic\n")
@@ -1006,7 +1188,6 @@ FIGHTING SPIRIT - NEVER BACK DOWN:
             logger.info("\n⏹️  Debate stopped by user")
         except Exception as e:
             logger.error(f"❌ Error in debate server: {e}", exc_info=True)
-            traceback.print_exc()
         finally:
             if ws_server:
                 logger.info("Closing WebSocket server...")
@@ -1028,9 +1209,11 @@ if __name__ == "__main__":
     logger.info("Creating DebateServer instance...")
     server = DebateServer()
 
-    logger.info("Starting server event loop...")
+    # Prefer uvloop when installed; fall back to the stdlib asyncio loop
+    run = uvloop.run if uvloop is not None else asyncio.run
+    logger.info(f"Starting server event loop ({'uvloop' if uvloop is not None else 'asyncio'})...")
     try:
-        asyncio.run(server.run())
+        run(server.run())
     except KeyboardInterrupt:
         logger.info("Server shutdown requested by user")
     except Exception as e:
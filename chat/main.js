@@ -368,6 +368,10 @@ window.addEventListener('load', async function() {
             // Track which speaker is currently receiving audio chunks
             this.currentlyReceivingAudio = null;
 
+            // Format of the background image announced by 'background_image_start'
+            // The next binary frame is the image itself, not audio
+            this.pendingBackgroundFormat = null;
+
             // HTML5 Audio elements for playback (one per speaker)
             this.audioPlayers = {
                 'Obama': new Audio(),
@@ -436,8 +440,15 @@ window.addEventListener('load', async function() {
             this.ws.onmessage = (event) => {
                 // Check if this is binary data (audio chunk) or text (JSON message)
                 if (event.data instanceof ArrayBuffer) {
-                    // Binary audio chunk - add to current speaker's buffer
-                    this.handleBinaryAudio(event.data);
+                    if (this.pendingBackgroundFormat) {
+                        // Binary background image announced by 'background_image_start'
+                        const format = this.pendingBackgroundFormat;
+                        this.pendingBackgroundFormat = null;
+                        this.loadBackgroundImage(event.data, format);
+                    } else {
+                        // Binary audio chunk - add to current speaker's buffer
+                        this.handleBinaryAudio(event.data);
+                    }
                 } else {
                     // Text JSON message
                     const msg = JSON.parse(event.data);
@@ -461,7 +472,7 @@ window.addEventListener('load', async function() {
          * - 'audio_start': Speaker's audio is about to stream
          * - 'audio_complete': Speaker's audio streaming finished
          * - 'text': Transcript text from a speaker
-         * - 'background_image': Generated background image from server
+         * - 'background_image_start': Generated background image follows as the next binary frame
          */
         handleMessage(msg) {
             switch(msg.type) {
@@ -469,9 +480,10 @@ window.addEventListener('load', async function() {
                     console.log('🎤 Debate topic:', msg.topic);
                     break;
 
-                case 'background_image':
-                    // Handle dynamically generated background image from server
-                    this.loadBackgroundImage(msg.data, msg.format);
+                case 'background_image_start':
+                    // Next binary frame is the dynamically generated background image
+                    console.log(`🎨 Receiving background image (${msg.size} bytes, format: ${msg.format})`);
+                    this.pendingBackgroundFormat = msg.format;
                     break;
 
                 case 'audio_start':
@@ -581,8 +593,8 @@ window.addEventListener('load', async function() {
         /**
          * Load and display a dynamically generated background image
          *
-         * This method receives a base64-encoded image from the server (generated by Gemini),
-         * decodes it, and loads it as a PIXI.Sprite background layer behind all characters.
+         * This method receives the raw image bytes from the server (generated by Gemini)
+         * and loads them as a PIXI.Sprite background layer behind all characters.
          *
          * Architecture:
          * - Image arrives asynchronously after debate starts (non-blocking)
@@ -592,14 +604,14 @@ window.addEventListener('load', async function() {
          *
          * Trade-offs:
          * - Cover scaling may crop image edges (better than letterboxing for fullscreen background)
-         * - Base64 decoding is synchronous but fast enough for typical image sizes
+         * - Image arrives as a binary frame, so there is no base64 decoding on the client
          * - No loading spinner (image appears when ready, gray background until then)
          *
-         * @param {string} base64Data - Base64-encoded image data from server
+         * @param {ArrayBuffer} imageData - Binary image data from server
          * @param {string} format - Image format (png, jpeg, etc.)
          */
-        async loadBackgroundImage(base64Data, format) {
-            console.log(`🎨 Loading background image (${base64Data.length} chars base64, format: ${format})`);
+        async loadBackgroundImage(imageData, format) {
+            console.log(`🎨 Loading background image (${imageData.byteLength} bytes, format: ${format})`);
 
             try {
                 // Remove existing background sprite if present
@@ -611,17 +623,9 @@ window.addEventListener('load', async function() {
                     backgroundSprite = null;
                 }
 
-                // Decode base64 to binary ArrayBuffer
-                // atob() converts base64 string to binary string, then we convert to Uint8Array
-                const binaryString = atob(base64Data);
-                const bytes = new Uint8Array(binaryString.length);
-                for (let i = 0; i < binaryString.length; i++) {
-                    bytes[i] = binaryString.charCodeAt(i);
-                }
-
                 // Create Blob from binary data
                 // Blob is required to create an object URL that PIXI can load
-                const blob = new Blob([bytes], { type: `image/${format}` });
+                const blob = new Blob([imageData], { type: `image/${format}` });
                 const imageUrl = URL.createObjectURL(blob);
 
                 console.log(`📥 Loading image texture from blob URL: ${imageUrl}`);
@@ -3,8 +3,8 @@ Debug script to test the full image generation and WebSocket integration
 
 This script simulates what the debate server does:
 1. Generate image
-2. Base64 encode it
-3. Send via WebSocket message (simulated)
+2. Build the background_image_start header
+3. Send the image as the following binary WebSocket frame (simulated)
 
 This helps verify the integration code is correct.
 """
@@ -82,49 +82,47 @@ async def test_full_integration():
 
     print(f"✅ Image generated: {len(image_bytes)} bytes, type: {mime_type}")
 
-    # Step 2: Base64 encode (same as in debate_server.py)
-    print("\n2️⃣  Base64 encoding image...")
-    image_base64 = base64.b64encode(image_bytes).decode('utf-8')
-    print(f"✅ Encoded to base64: {len(image_base64)} characters")
-
-    # Step 3: Create WebSocket message (same as in debate_server.py)
-    print("\n3️⃣  Creating WebSocket message...")
+    # Step 2: Create WebSocket header message (same as in debate_server.py)
+    print("\n2️⃣  Creating background_image_start header...")
     image_format = mime_type.split('/')[-1] if mime_type else 'png'
 
-    message = {
-        'type': 'background_image',
-        'data': image_base64,
+    header = {
+        'type': 'background_image_start',
         'format': image_format,
+        'size': len(image_bytes),
         'topic': topic
     }
 
-    message_json = json.dumps(message)
-    print(f"✅ Message created: {len(message_json)} bytes JSON")
+    header_json = json.dumps(header)
+    print(f"✅ Header created: {len(header_json)} bytes JSON")
+
+    # Step 3: The image itself goes out as the next, binary frame
+    print("\n3️⃣  Preparing binary frame...")
+    frame = bytes(image_bytes)
+    print(f"✅ Binary frame: {len(frame)} bytes (no base64)")
 
-    # Step 4: Verify message can be parsed
-    print("\n4️⃣  Verifying message can be parsed...")
+    # Step 4: Verify the header can be parsed and describes the frame
+    print("\n4️⃣  Verifying header matches binary frame...")
     try:
-        parsed = json.loads(message_json)
+        parsed = json.loads(header_json)
         print(f"✅ Message type: {parsed['type']}")
         print(f"✅ Image format: {parsed['format']}")
         print(f"✅ Topic: {parsed['topic']}")
-        print(f"✅ Base64 data length: {len(parsed['data'])}")
+        print(f"✅ Announced size: {parsed['size']}")
 
-        # Verify we can decode the base64 back
-        decoded_bytes = base64.b64decode(parsed['data'])
-        print(f"✅ Decoded back to {len(decoded_bytes)} bytes")
-
-        if len(decoded_bytes) == len(image_bytes):
-            print("✅ Decoded size matches original!")
+        if parsed['size'] == len(frame):
+            print("✅ Announced size matches binary frame!")
         else:
-            print(f"⚠️  Size mismatch: original={len(image_bytes)}, decoded={len(decoded_bytes)}")
+            print(f"⚠️  Size mismatch: announced={parsed['size']}, frame={len(frame)}")
 
     except Exception as e:
-        print(f"❌ Error parsing/decoding: {e}")
+        print(f"❌ Error parsing header: {e}")
         return
 
     # Step 5: Save a test HTML file to verify frontend can decode
+    # (base64 is only used to embed the image in the standalone HTML file)
     print("\n5️⃣  Creating test HTML file to verify frontend decoding...")
+    image_base64 = base64.b64encode(image_bytes).decode('utf-8')
 
     html_content = f"""<!DOCTYPE html>
 <html>
@@ -11,7 +11,6 @@ Run this instead of debate_server.py to isolate the background generation featur
 
 import asyncio
 import json
-import base64
 import os
 import logging
 from google import genai
@@ -97,19 +96,19 @@ async def handle_client(websocket):
             if image_bytes:
                 logger.info(f"✅ Image generated: {len(image_bytes)} bytes")
 
-                # Encode and send
-                image_base64 = base64.b64encode(image_bytes).decode('utf-8')
+                # Send header, then the raw image as a binary frame
                 image_format = mime_type.split('/')[-1] if mime_type else 'png'
 
-                message = json.dumps({
-                    'type': 'background_image',
-                    'data': image_base64,
+                header = json.dumps({
+                    'type': 'background_image_start',
                     'format': image_format,
+                    'size': len(image_bytes),
                     'topic': topic
                 })
 
-                logger.info(f"📤 Sending image to client ({len(message)} bytes)")
-                await websocket.send(message)
+                logger.info(f"📤 Sending image to client ({len(image_bytes)} bytes binary)")
+                await websocket.send(header)
+                await websocket.send(image_bytes)
                 logger.info("✅ Image sent!")
 
             else: